@@ -1,23 +1,49 @@
+import time
+startup_started = time.perf_counter()
+
+import os
 import pygame
 import sys
-import math
-from queue import PriorityQueue
+import threading
 import uielements  # Importing UI elements file
 from uielements import horizontal_buttons
 import weatherDisplay
-from CoordConv import grid_to_latitude, grid_to_longitude, latitude_to_grid, longitude_to_grid, round_longitude, round_latitude
-import storage  # For the map boundary
-from heuristicRetriever import HeuristicRetriever
+from CoordConv import grid_to_latitude, grid_to_longitude, latitude_to_grid, longitude_to_grid, GRID_COLS, GRID_ROWS
 from intro_animation import play_intro_animation  # Importing the intro animation module
-import WindRetriever
-import currentDirRetriever   
-from depthCells import retrieve_depth
+
+# Startup time report: run with --startup-report or SIH_STARTUP_REPORT=1
+STARTUP_REPORT = "--startup-report" in sys.argv or bool(os.getenv("SIH_STARTUP_REPORT"))
+startup_marks = {}
+
+def mark_startup(label):
+    startup_marks[label] = time.perf_counter() - startup_started
+    if STARTUP_REPORT:
+        print(f"[startup] {label:<22} {startup_marks[label] * 1000:8.1f} ms")
+
+mark_startup("imports")
+
+# Routing data loads in the background while the intro video plays
+route_engine = None
+route_engine_ready = threading.Event()
+
+def load_route_engine():
+    global route_engine
+    try:
+        from routeEngine import RouteEngine  # Pulls in NumPy and the environment data
+        from routeCache import RouteCache, CACHE_FILE
+        route_engine = RouteEngine(cache=RouteCache(cache_file=CACHE_FILE), port_tables=True)
+        mark_startup("route engine ready")
+    except Exception as e:
+        print(f"Error loading routing data: {e}")
+    finally:
+        route_engine_ready.set()
+
+threading.Thread(target=load_route_engine, daemon=True).start()
 
 clock = pygame.time.Clock()
 
 # Initialize Pygame
 pygame.init()
-heuristic_retriever = HeuristicRetriever()
 intro_video_path = "./Countdown1.mp4"
 
 # Set up the display
@@ -25,8 +51,10 @@ info = pygame.display.Info()  # Get display information
 screen_width, screen_height = info.current_w, info.current_h
 screen = pygame.display.set_mode((screen_width, screen_height), pygame.FULLSCREEN)
 pygame.display.set_caption("Ship Navigation Algo")
+mark_startup("display")
 
 play_intro_animation(screen, intro_video_path, screen_width, screen_height)
+mark_startup("intro finished")
 background_image = pygame.image.load("background.jpg")  # Replace with your image path
 background_image = pygame.transform.scale(background_image, (screen_width, screen_height))
 
@@ -70,213 +98,60 @@ def drawGrid():
         if(y>350):
             pygame.draw.line(screen, BLUE, (map_position[0], y), (map_position[0] + 550, y))
 
- 
-def is_aligned_with_wind(long, lat, dx, dy):
-    """
-    Determines if the movement direction (dx, dy) aligns with the wind direction.
-    
-    :param dx: Movement in the x-direction (grid coordinates)
-    :param dy: Movement in the y-direction (grid coordinates)
-    :return: 1 if aligned within a 12.5° range, 0 otherwise
-    """
-    
-    # Convert grid coordinates to geographical coordinates
-    geo_latitude = round_latitude(grid_to_latitude(lat))
-    geo_longitude = round_longitude(grid_to_longitude(long))
-    
-     
-    # Instantiate WindDirectionRetriever and retrieve wind direction for the given geographical location
-    retriever = WindRetriever.WindDirectionRetriever()  # Instantiating the WindDirectionRetriever
-    wind_direction = retriever.retrieve_wind_direction(geo_longitude, geo_latitude)
-     
-    # Calculate and normalize the movement angle
-    movement_angle = round(math.degrees(math.atan2(dy, dx))) % 360
-
-    # Define the alignment range (±25° around the wind direction)
-    lower_bound = (wind_direction - 25) % 360
-    upper_bound = (wind_direction + 25) % 360
-    
-    
 
-    # Check if the movement angle is within the alignment range
-    if (lower_bound <= movement_angle <= upper_bound) or (lower_bound > upper_bound and (movement_angle >= lower_bound or movement_angle <= upper_bound)):
-        print(geo_longitude, geo_latitude, 1, wind_direction, movement_angle)
-        return 1
-    else:
-        print(geo_longitude, geo_latitude, 0, wind_direction, movement_angle)
-        return 0
+# Routing runs headless in routeEngine; the UI only draws what it explores
+EXPLORE_FLIP_EVERY = 20  # Explored cells drawn between display updates
+explored_drawn = 0
 
 
-def is_aligned_with_current(long, lat, dx, dy):
-    """
-    Determines if the movement direction (dx, dy) aligns with the ocean current direction.
-    
-    :param long: Longitude in grid coordinates
-    :param lat: Latitude in grid coordinates
-    :param dx: Movement in the x-direction (grid coordinates)
-    :param dy: Movement in the y-direction (grid coordinates)
-    :return: 1 if aligned within a 25° range, 0 otherwise
-    """
-    
-    # Convert grid coordinates to geographical coordinates
-    geo_latitude = round_latitude(grid_to_latitude(lat))
-    geo_longitude = round_longitude(grid_to_longitude(long))
-    
-    # Instantiate CurrentRetriever and retrieve current direction for the given geographical location
-    retriever = currentDirRetriever.OceanCurrentRetriever()  # Instantiating the CurrentDirectionRetriever
-    current_direction = retriever.retrieve_angle(geo_longitude, geo_latitude)
-    
-    # Calculate and normalizing the movement angle
-    movement_angle = round(math.degrees(math.atan2(dy, dx))) % 360
-
-    # Alignment range (±25° around the current direction)
-    lower_bound = (current_direction - 25) % 360
-    upper_bound = (current_direction + 25) % 360
-    
-    # Checking if the movement angle is within the alignment range
-    if (lower_bound <= movement_angle <= upper_bound) or (lower_bound > upper_bound and (movement_angle >= lower_bound or movement_angle <= upper_bound)):
-        print(geo_longitude, geo_latitude, 1, current_direction, movement_angle)
-        return 1
-    else:
-        print(geo_longitude, geo_latitude, 0, current_direction, movement_angle)
-        return 0
-
-
-    
-# A* Algorithm with new heuristic integration
-def euclidean(a, b):
-    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
- 
-def h_heuristic(node):
-    grid_x, grid_y = node
-    latitude = round_latitude(grid_to_latitude(grid_y))
-    longitude = round_longitude(grid_to_longitude(grid_x))
-    
-    heuristic_value = heuristic_retriever.get_heuristic_value(latitude, longitude, "heuristics_data.pkl")
-    print("h:", heuristic_value)
-    return heuristic_value
-
-#adjust this on the day of hackathon
-def calculate_fscore(g_score, current, neighbor, end, is_first_box_green, is_second_box_green, wind_alignment, current_alignment):
-    
-    f_score = 0
-    
-    if is_first_box_green:  # cargo
-        f_score = 0.3 * g_score + 0.7 * euclidean(neighbor, end) + 0.1 * h_heuristic(neighbor)
-
-    elif is_second_box_green:  # passenger
-        f_score = 0.3 * g_score + 0.2 * euclidean(neighbor, end) + 1 * h_heuristic(neighbor)
-         #combined 
-    
-    else: #individual optimisation
-        if horizontal_buttons[0]:  # Fuel
-            f_score = 0.4 * g_score + 0.2 * euclidean(neighbor, end) + 0.1 * h_heuristic(neighbor)
-            
-        elif horizontal_buttons[1]:  # Speed
-            f_score = 0.3 * g_score + 0.7 * euclidean(neighbor, end) + 0.1 * h_heuristic(neighbor)
-            
-        elif horizontal_buttons[2]:  # Comfort
-            f_score = 0.3 * g_score + 0.2 * euclidean(neighbor, end) + 1 * h_heuristic(neighbor)
-            
-        else:  
-            pass
-
-    if wind_alignment == 1:
-        f_score *= 0.9
-        
-    if current_alignment ==1:
-        f_score *= 0.9
-        
-    
-    return f_score
+def draw_explored(cell):
+    global explored_drawn
+    pygame.draw.rect(screen, RED, (map_position[0] + cell[0] * grid_size,
+                                   map_position[1] + cell[1] * grid_size,
+                                   grid_size, grid_size))
+    explored_drawn += 1
+    if explored_drawn % EXPLORE_FLIP_EVERY == 0:
+        pygame.display.flip()
 
 
 def a_star(start, end, is_first_box_green, is_second_box_green):
-    open_set = PriorityQueue()
-    open_set.put((0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: calculate_fscore(g_score[start], start, start, end, is_first_box_green, is_second_box_green, 0, 0)}  # Initial alignment is 0 (not used yet)
-    explored_nodes = []
-
-    while not open_set.empty():
-        _, current = open_set.get()
-
-        # Visualize exploration
-        if current != start and current != end:
-            explored_nodes.append(current)
-            pygame.draw.rect(screen, RED, (map_position[0] + current[0] * grid_size,
-                                           map_position[1] + current[1] * grid_size,
-                                           grid_size, grid_size))
-            pygame.display.flip()
-            pygame.time.delay(20)  # Slow down to visualize
-        
-        if current == end:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.reverse()
-            
-            # Reconstructing the green path
-            background()
-            drawGrid()
-            foreground()
-            weatherDisplay.weather(screen, 28.6139, 77.2090)
-            weatherDisplay.weatherTwo(screen, 35.00, 45.2090)
-            uielements.draw_fuel_estimation_button(screen)
-            uielements.draw_image_analysis_button(screen)
-            uielements.draw_retrain_model_button(screen)
-            uielements.draw_path_coordinates_button(screen)
-            
-            
-            pygame.display.flip()
-            pygame.time.delay(500) 
-            
-            # Draw path on screen
-            for cell in path:
-                pygame.draw.rect(screen, GREEN, (map_position[0] + cell[0] * grid_size,
-                                                 map_position[1] + cell[1] * grid_size,
-                                                 grid_size, grid_size))
-                pygame.display.flip()
-                pygame.time.delay(200)
-                print("Path:", cell)
-                
-            pygame.time.delay(5000)
-            
-            return path, explored_nodes
+    from routeEngine import mode_from_ui
+    route_engine_ready.wait()  # Only blocks if Start is pressed before loading finished
+    if route_engine is None:
+        return None, []
+    mode = mode_from_ui(is_first_box_green, is_second_box_green, horizontal_buttons)
+    result = route_engine.route(start, end, mode, on_expand=draw_explored)
+    print("Route stats:", result.stats)
+
+    if not result.found:
+        return None, result.explored
+
+    # Reconstructing the green path
+    background()
+    drawGrid()
+    foreground()
+    weatherDisplay.weather(screen, 28.6139, 77.2090)
+    weatherDisplay.weatherTwo(screen, 35.00, 45.2090)
+    uielements.draw_fuel_estimation_button(screen)
+    uielements.draw_image_analysis_button(screen)
+    uielements.draw_retrain_model_button(screen)
+    uielements.draw_path_coordinates_button(screen)
 
-        neighbors = get_neighbors(current)
-        for neighbor, wind_alignment, current_alignment in neighbors:
-            tentative_g_score = g_score[current] + euclidean(current, neighbor)
-            tentative_f_score = calculate_fscore(tentative_g_score, current, neighbor, end, is_first_box_green, is_second_box_green, wind_alignment, current_alignment)
-            
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_f_score
-                open_set.put((f_score[neighbor], neighbor))
+    pygame.display.flip()
+    pygame.time.delay(500)
 
-    return None, explored_nodes
+    # Draw path on screen
+    for cell in result.path:
+        pygame.draw.rect(screen, GREEN, (map_position[0] + cell[0] * grid_size,
+                                         map_position[1] + cell[1] * grid_size,
+                                         grid_size, grid_size))
+        pygame.display.flip()
+        pygame.time.delay(200)
+        print("Path:", cell)
 
-blocks = storage.Backup_black_cells #remove if changing the map
+    pygame.time.delay(5000)
 
-# Get neighbors for A* (8-way movement)
-def get_neighbors(position):
-    neighbors = []
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
-    
-    for dx, dy in directions:
-        nx, ny = position[0] + dx, position[1] + dy
-        if 0 <= nx < grid_width/grid_size and 0 <= ny < grid_height/grid_size:
-            if not is_black_pixel(nx, ny) and (nx, ny) not in blocks  and retrieve_depth(nx,ny) < -48:
-                print(retrieve_depth(nx,ny))
-                # Check if the movement is aligned with the wind
-                wind_alignment = is_aligned_with_wind(position[0]+dx, position[1]+dy, dx, dy)
-                current_alignment = is_aligned_with_current(position[0]+dx, position[1]+dy, dx, dy)
-                # Append the neighbor along with the wind alignment value
-                neighbors.append(((nx, ny), wind_alignment, current_alignment))
-    return neighbors
+    return result.path, result.explored
 
 
 # Function to check if a pixel is black
@@ -398,8 +273,8 @@ while running:
                 end = (longitude_to_grid(end_longitude), latitude_to_grid(end_latitude))
                 print(start,end)
                 # Validate the grid coordinates
-                if 0 <= start[0] < grid_width and 0 <= start[1] < grid_height and \
-                0 <= end[0] < grid_width and 0 <= end[1] < grid_height:
+                if 0 <= start[0] < GRID_COLS and 0 <= start[1] < GRID_ROWS and \
+                0 <= end[0] < GRID_COLS and 0 <= end[1] < GRID_ROWS:
                     # Call A* algorithm
                     path, explored_nodes = a_star(start, end, cargo, passenger)
                     if path:
@@ -431,5 +306,11 @@ while running:
             print("Please enter valid integers for coordinates")
 
     pygame.display.flip()
+    if "first frame" not in startup_marks:
+        mark_startup("first frame")  # time-to-interactive
     clock.tick(30)
     
+
+# Keep the route cache for the next session
+if route_engine is not None:
+    route_engine.cache.save()
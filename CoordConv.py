@@ -1,3 +1,9 @@
+# Routing grid geometry: the 550x600 map is split into GRID_SIZE pixel cells
+GRID_SIZE = 4
+MAP_WIDTH, MAP_HEIGHT = 550, 600
+GRID_COLS = -(-MAP_WIDTH // GRID_SIZE)  # 138, same bound as get_neighbors' nx < 550 / 4
+GRID_ROWS = -(-MAP_HEIGHT // GRID_SIZE)  # 150
+
 def grid_to_latitude(grid_y):
     northernmost_latitude = 37.1
     northernmost_grid_y = 9
@@ -21,6 +21,8 @@ from shapely.geometry import Point, Polygon
 import numpy as np
 import itertools
 
+from forecastLayers import build_forecast_layers
+
 def generate_coordinates(
     bottom_right=(5.060000, 88.760000),
     top_right=(21.3, 88.76),
@@ -432,7 +434,12 @@ def main():
     # Step 4: Split data by date    
     print("\n--- Step 4: Splitting Data by Date ---")
     output_dir = "split_data_outputs"
-    split_data_evenly(combined_file, output_dir)
+    split_dir = split_data_evenly(combined_file, output_dir)
+
+    # Step 5: Per-date environment layers for the forecast window
+    print("\n--- Step 5: Building Per-Date Environment Layers ---")
+    currents_file = "merged_data_20241211_20241216.csv"
+    build_forecast_layers(split_dir, currents_file if os.path.exists(currents_file) else None)
 
     print("\nWeather Data Processing Complete!")
 
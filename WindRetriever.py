@@ -1,5 +1,18 @@
+import os
 import pickle
-import pandas as pd
+import numpy as np
+
+# Coordinates are matched at the 3 decimals round_latitude / round_longitude produce
+COORDINATE_SCALE = 1000
+LATITUDE_SPAN = 1 << 20  # room for any scaled latitude in the combined key
+
+
+def coordinate_keys(longitudes, latitudes):
+    """Pack longitude/latitude pairs into sortable int64 keys."""
+    lon_keys = np.round(np.asarray(longitudes, dtype=float) * COORDINATE_SCALE).astype(np.int64)
+    lat_keys = np.round(np.asarray(latitudes, dtype=float) * COORDINATE_SCALE).astype(np.int64)
+    return lon_keys * LATITUDE_SPAN + (lat_keys + LATITUDE_SPAN // 2)
+
 
 class WindDirectionRetriever:
     def __init__(self, pkl_file='longitude_latitude_wind_direction.pkl'):
@@ -7,15 +20,52 @@ class WindDirectionRetriever:
         with open(pkl_file, 'rb') as f:
             self.data = pickle.load(f)
 
-    def retrieve_wind_direction(self, longitude, latitude):
-        # Filter the data based on the provided longitude and latitude
-        result = self.data[(self.data['longitude'] == longitude) & (self.data['latitude'] == latitude)]
+        # Sorted index over the coordinates, keeping the first row per coordinate
+        keys = coordinate_keys(self.data['longitude'].values, self.data['latitude'].values)
+        self.keys, first_rows = np.unique(keys, return_index=True)
+        self.directions = self.data['wind_direction_10m_dominant'].values[first_rows].astype(float)
+        # Hash index for single lookups
+        self.index = dict(zip(self.keys.tolist(), self.directions.tolist()))
 
+    def retrieve_wind_direction(self, longitude, latitude):
         # Return the wind direction or the default value of 0
-        if not result.empty:
-            return result['wind_direction_10m_dominant'].values[0]
-        else:
-            return 0  # Default value
+        key = round(longitude * COORDINATE_SCALE) * LATITUDE_SPAN + round(latitude * COORDINATE_SCALE) + LATITUDE_SPAN // 2
+        return self.index.get(key, 0)
+
+    def retrieve_many(self, longitudes, latitudes, default=0.0):
+        """
+        Retrieve wind directions for many coordinates in one vectorized call.
+
+        Args:
+            longitudes (array-like): Longitude of each point.
+            latitudes (array-like): Latitude of each point, broadcastable with longitudes.
+            default (float): Value for points without data.
+
+        Returns:
+            np.ndarray: Wind direction in degrees for each point.
+        """
+        keys = coordinate_keys(longitudes, latitudes)
+        if len(self.keys) == 0:
+            return np.full(keys.shape, default, dtype=float)
+        positions = np.searchsorted(self.keys, keys)
+        positions = np.minimum(positions, len(self.keys) - 1)
+        found = self.keys[positions] == keys
+        return np.where(found, self.directions[positions], default)
+
+
+_shared_retrievers = {}
+
+
+def get_shared_retriever(pkl_file='longitude_latitude_wind_direction.pkl'):
+    """
+    Return the process-wide retriever for a pickle file, loading it on first use.
 
-retriever = WindDirectionRetriever()  # Load the pickle file only once
- 
+    The file's size and modification time are checked on every call, so a
+    regenerated pickle is picked up instead of serving the old data.
+    """
+    stat = os.stat(pkl_file)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _shared_retrievers.get(pkl_file)
+    if cached is None or cached[0] != signature:
+        _shared_retrievers[pkl_file] = (signature, WindDirectionRetriever(pkl_file))
+    return _shared_retrievers[pkl_file][1]
@@ -0,0 +1,228 @@
+"""
+Any-angle routing with Lazy Theta*.
+
+8-way grid routes zig-zag through hundreds of cells even across open sea.
+Theta* lets a cell take its grandparent as parent whenever the straight segment
+between them is clear, so routes become short lists of waypoints joined by
+straight legs, which is also what bridge systems consume. The lazy variant
+assumes the segment is clear when a cell is pushed and only checks line of
+sight once the cell is expanded, which saves most of the checks.
+
+A straight leg is checked and costed along its Bresenham line: every step of
+that line is one of the 8 grid moves, so the leg is blocked exactly when one
+of those moves is impossible, and its cost is the moves' cost scaled down by
+how much shorter the straight leg is than the staircase of moves.
+"""
+import math
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, STEP_LENGTHS, path_length
+from costTensor import edge_cost_tensor, lower_bound_scale
+
+MOVE_INDEX = {move: k for k, move in enumerate(DIRECTIONS)}
+
+
+def line_cells(a, b):
+    """
+    Cells of the Bresenham line from a to b.
+
+    Returns:
+        list: Cells (grid_x, grid_y) after a up to and including b.
+    """
+    x, y = a
+    x1, y1 = b
+    dx, dy = abs(x1 - x), abs(y1 - y)
+    sx, sy = (1 if x1 > x else -1), (1 if y1 > y else -1)
+    error = dx - dy
+    cells = []
+    while (x, y) != (x1, y1):
+        doubled = 2 * error
+        if doubled > -dy:
+            error -= dy
+            x += sx
+        if doubled < dx:
+            error += dx
+            y += sy
+        cells.append((x, y))
+    return cells
+
+
+def expand_waypoints(start, waypoints):
+    """Turn a waypoint route walked from start back into consecutive grid cells."""
+    cells = []
+    previous = start
+    for waypoint in waypoints:
+        cells.extend(line_cells(previous, waypoint))
+        previous = waypoint
+    return cells
+
+
+def segment_cost(costs, cols, directions, a, b):
+    """
+    Cost of the straight leg from a to b, or inf if it is blocked.
+
+    Args:
+        costs: Flat (rows * cols * 8) sequence of move costs.
+        cols (int): Grid width.
+        directions (int): Moves per cell.
+        a (tuple): Leg start (grid_x, grid_y).
+        b (tuple): Leg end (grid_x, grid_y).
+    """
+    total = 0.0
+    walked = 0.0
+    x, y = a
+    for nx, ny in line_cells(a, b):
+        k = MOVE_INDEX[(nx - x, ny - y)]
+        move_cost = costs[(y * cols + x) * directions + k]
+        if move_cost == math.inf:
+            return math.inf
+        total += move_cost
+        walked += STEP_LENGTHS[k]
+        x, y = nx, ny
+    if walked == 0.0:
+        return 0.0
+    return total * math.hypot(b[0] - a[0], b[1] - a[1]) / walked
+
+
+def theta_star_search(navigable, start, end, weights, heuristic, alignment, on_expand=None, edge_costs=None):
+    """
+    Find an any-angle route with Lazy Theta*.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        edge_costs (np.ndarray): Precomputed edge_cost_tensor for these inputs.
+
+    Returns:
+        tuple: (waypoints or None, explored cells, stats dict). Waypoints exclude
+        start and end with end; expand_waypoints gives the cells in between.
+    """
+    if edge_costs is None:
+        edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+    rows, cols, directions = edge_costs.shape
+    size = rows * cols
+    end_x, end_y = end
+    scale = lower_bound_scale(edge_costs)
+    costs = memoryview(np.ascontiguousarray(edge_costs, dtype=np.float32).reshape(-1))
+
+    g_score = array('d', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    moves = [(k, dx, dy, dy * cols + dx) for k, (dx, dy) in enumerate(DIRECTIONS)]
+
+    start_id = start[1] * cols + start[0]
+    end_id = end_y * cols + end_x
+    g_score[start_id] = 0.0
+    parent[start_id] = start_id
+    open_heap = [(0.0, start_id)]
+
+    explored = []
+    pushes = 1
+    stale_pops = 0
+    peak_open = 1
+    sight_checks = 0
+    sight_failures = 0
+    found = False
+
+    while open_heap:
+        _, cell_id = heappop(open_heap)
+        if closed[cell_id]:
+            stale_pops += 1
+            continue
+        closed[cell_id] = 1
+
+        y, x = divmod(cell_id, cols)
+        if cell_id != start_id:
+            # Lazy step: cost the assumed leg from the parent for real, and keep
+            # the cheapest closed grid neighbour in case the leg is blocked or dearer
+            parent_id = parent[cell_id]
+            py, px = divmod(parent_id, cols)
+            best = math.inf
+            if max(abs(px - x), abs(py - y)) > 1:
+                sight_checks += 1
+                best = g_score[parent_id] + segment_cost(costs, cols, directions, (px, py), (x, y))
+                if best == math.inf:
+                    sight_failures += 1
+            for k, dx, dy, offset in moves:
+                nx, ny = x - dx, y - dy
+                if not (0 <= nx < cols and 0 <= ny < rows):
+                    continue
+                neighbor_id = cell_id - offset
+                if closed[neighbor_id]:
+                    through = g_score[neighbor_id] + costs[neighbor_id * directions + k]
+                    if through < best:
+                        best = through
+                        parent_id = neighbor_id
+            g_score[cell_id] = best
+            parent[cell_id] = parent_id
+            if cell_id != end_id:
+                explored.append((x, y))
+                if on_expand is not None:
+                    on_expand((x, y))
+
+        if cell_id == end_id:
+            found = True
+            break
+
+        g = g_score[cell_id]
+        parent_id = parent[cell_id]
+        py, px = divmod(parent_id, cols)
+        leg_length = math.hypot(x - px, y - py)
+        # Cost per unit length of the leg into this cell, to price the legs
+        # its neighbours are assumed to get from the same parent
+        rate = (g - g_score[parent_id]) / leg_length if leg_length else 0.0
+        base = cell_id * directions
+        for k, dx, dy, offset in moves:
+            move_cost = costs[base + k]
+            if move_cost == math.inf:
+                continue
+            neighbor_id = cell_id + offset
+            if closed[neighbor_id]:
+                continue
+            nx, ny = x + dx, y + dy
+            tentative_g = g + move_cost
+            candidate = cell_id
+            if parent_id != cell_id:
+                through_parent = g_score[parent_id] + rate * math.hypot(nx - px, ny - py)
+                if through_parent < tentative_g:
+                    tentative_g = through_parent
+                    candidate = parent_id
+            if tentative_g < g_score[neighbor_id]:
+                g_score[neighbor_id] = tentative_g
+                parent[neighbor_id] = candidate
+                heappush(open_heap, (tentative_g + scale * math.hypot(nx - end_x, ny - end_y), neighbor_id))
+                pushes += 1
+        if len(open_heap) > peak_open:
+            peak_open = len(open_heap)
+
+    stats = {
+        "expanded": len(explored),
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "sight_checks": sight_checks,
+        "sight_failures": sight_failures,
+        "cost": g_score[end_id],
+        "distance": math.inf,
+    }
+    if not found:
+        return None, explored, stats
+
+    waypoints = []
+    cell_id = end_id
+    while cell_id != start_id:
+        y, x = divmod(cell_id, cols)
+        waypoints.append((x, y))
+        cell_id = parent[cell_id]
+    waypoints.reverse()
+    stats["distance"] = path_length(start, waypoints)
+    stats["waypoints"] = len(waypoints)
+    return waypoints, explored, stats
@@ -0,0 +1,186 @@
+"""
+Anytime Repairing A* (ARA*) with a latency budget.
+
+The first route comes from weighted A* (priority g + inflation * h), which is
+found quickly but may cost up to inflation times the optimum. The inflation is
+then lowered step by step, and each pass reuses the previous search's g-scores
+and only re-expands cells whose cost improved, so every pass is much cheaper
+than a fresh search. When the time or expansion budget runs out, the best route
+so far is returned together with the suboptimality bound proven for it.
+
+The initial inflation comes from calculate_fscore's weights: relative to the
+g_score weight, the distance-to-end term is weighted (g_weight + distance_weight)
+/ g_weight times, so that is how greedy the first pass is.
+"""
+import math
+import time
+from array import array
+from heapq import heappush, heappop, heapify
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, reconstruct_path, path_length
+from costTensor import edge_cost_tensor, lower_bound_scale
+
+# Inflation used when the mode has no g_score weight
+DEFAULT_INFLATION = 2.5
+# Amount the inflation is lowered by after each pass
+INFLATION_STEP = 0.5
+
+
+def initial_inflation(weights):
+    """Inflation of the first ARA* pass for calculate_fscore weights."""
+    g_weight, distance_weight, _ = weights
+    if g_weight <= 0:
+        return DEFAULT_INFLATION
+    return max(1.0, (g_weight + distance_weight) / g_weight)
+
+
+def anytime_search(navigable, start, end, weights, heuristic, alignment, on_expand=None,
+                   edge_costs=None, time_budget=None, max_expansions=None, inflation=None):
+    """
+    Find a route with ARA*, improving it until optimal or out of budget.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        edge_costs (np.ndarray): Precomputed edge_cost_tensor for these inputs.
+        time_budget (float): Seconds to search for; None for no limit.
+        max_expansions (int): Expansions allowed over all passes; None for no limit.
+        inflation (float): Inflation of the first pass; see initial_inflation if None.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict). stats['bound'] is the
+        factor the route's cost is proven to be within of the optimum, and
+        stats['improvements'] lists (cost, bound, elapsed, expansions) after each pass.
+    """
+    started = time.perf_counter()
+    if edge_costs is None:
+        edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+    if inflation is None:
+        inflation = initial_inflation(weights)
+    if inflation < 1:
+        raise ValueError("inflation must be at least 1")
+    rows, cols, directions = edge_costs.shape
+    size = rows * cols
+    end_x, end_y = end
+    scale = lower_bound_scale(edge_costs)
+    costs = memoryview(np.ascontiguousarray(edge_costs, dtype=np.float32).reshape(-1))
+    deadline = started + time_budget if time_budget is not None else math.inf
+
+    g_score = array('d', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    moves = [(dx, dy, dy * cols + dx) for dx, dy in DIRECTIONS]
+
+    def estimate(cell_id):
+        y, x = divmod(cell_id, cols)
+        return scale * math.hypot(x - end_x, y - end_y)
+
+    start_id = start[1] * cols + start[0]
+    end_id = end_y * cols + end_x
+    g_score[start_id] = 0.0
+    # Entries carry the g-score they were pushed with; older ones are stale
+    open_heap = [(inflation * estimate(start_id), 0.0, start_id)]
+    inconsistent = set()
+
+    explored = []
+    seen = bytearray(size)
+    expansions = 0
+    pushes = 1
+    stale_pops = 0
+    peak_open = 1
+    passes = 0
+    best_path = None
+    bound = math.inf
+    improvements = []
+    exhausted = False
+
+    while not exhausted:
+        passes += 1
+        closed = bytearray(size)
+        while open_heap:
+            key, g, cell_id = open_heap[0]
+            if closed[cell_id] or g != g_score[cell_id]:
+                heappop(open_heap)
+                stale_pops += 1
+                continue
+            if key >= g_score[end_id]:
+                break  # Nothing left can improve the route at this inflation
+            if (max_expansions is not None and expansions >= max_expansions) or \
+                    (expansions % 64 == 0 and time.perf_counter() > deadline):
+                exhausted = True
+                break
+            heappop(open_heap)
+            closed[cell_id] = 1
+            expansions += 1
+
+            y, x = divmod(cell_id, cols)
+            if not seen[cell_id] and cell_id != start_id and cell_id != end_id:
+                seen[cell_id] = 1
+                explored.append((x, y))
+                if on_expand is not None:
+                    on_expand((x, y))
+
+            base = cell_id * directions
+            for k, (dx, dy, offset) in enumerate(moves):
+                move_cost = costs[base + k]
+                if move_cost == math.inf:
+                    continue
+                neighbor_id = cell_id + offset
+                tentative_g = g + move_cost
+                if tentative_g < g_score[neighbor_id]:
+                    g_score[neighbor_id] = tentative_g
+                    parent[neighbor_id] = cell_id
+                    if closed[neighbor_id]:
+                        inconsistent.add(neighbor_id)
+                    else:
+                        heappush(open_heap, (tentative_g + inflation * estimate(neighbor_id), tentative_g, neighbor_id))
+                        pushes += 1
+            if len(open_heap) > peak_open:
+                peak_open = len(open_heap)
+
+        cost = g_score[end_id]
+        if cost < math.inf and (best_path is None or cost < improvements[-1][0] or not exhausted):
+            if not exhausted:
+                # Bound from the cheapest cell that could still lead to a better route
+                frontier = [g_score[cell_id] + estimate(cell_id) for _, g, cell_id in open_heap if g == g_score[cell_id]]
+                frontier += [g_score[cell_id] + estimate(cell_id) for cell_id in inconsistent]
+                lowest = min(frontier, default=cost)
+                bound = 1.0 if lowest >= cost else min(inflation, cost / lowest) if lowest > 0 else inflation
+            elif best_path is not None:
+                # Interrupted pass: a cheaper route keeps the old proof, scaled down
+                bound *= cost / improvements[-1][0]
+            best_path = reconstruct_path(parent, cols, start_id, end_id)
+            improvements.append((cost, bound, time.perf_counter() - started, expansions))
+        elif cost == math.inf and not exhausted:
+            break  # Unreachable
+
+        if exhausted or bound <= 1.0 or inflation <= 1.0 and not inconsistent:
+            break
+        # Next pass: lower the inflation and requeue the cells whose cost improved
+        inflation = max(1.0, inflation - INFLATION_STEP)
+        cells = {cell_id for _, g, cell_id in open_heap if g == g_score[cell_id]} | inconsistent
+        open_heap = [(g_score[cell_id] + inflation * estimate(cell_id), g_score[cell_id], cell_id) for cell_id in cells]
+        heapify(open_heap)
+        inconsistent = set()
+
+    stats = {
+        "expanded": len(explored),
+        "expansions": expansions,
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "passes": passes,
+        "inflation": inflation,
+        "bound": bound,
+        "budget_exhausted": exhausted,
+        "improvements": improvements,
+        "cost": improvements[-1][0] if improvements else math.inf,
+        "distance": path_length(start, best_path) if best_path is not None else math.inf,
+    }
+    return best_path, explored, stats
@@ -0,0 +1,131 @@
+"""
+Parallel batch routing over a process pool.
+
+The parent process loads the navigability raster and the environment layers,
+builds the alignment and edge-cost tensors once and writes all of them as .npy
+files to a scratch directory. Every worker maps those files read-only, so all
+processes share the same pages through the OS page cache instead of each
+unpickling the retriever data or rebuilding the tensors. Jobs are submitted one
+per future and results are yielded in completion order.
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from routeEngine import RouteEngine, RouteResult
+from environmentField import EnvironmentField, DEFAULT_DATE
+
+# Engine of the current worker process, built once by _init_worker
+_worker_engine = None
+
+
+def export_layers(engine, date, directory):
+    """
+    Write an engine's navigability raster, one date's layers and the tensors
+    already built from them as .npy files.
+
+    The tensors are the alignment tensor and the edge costs of every mode
+    computed so far, so workers map them instead of rebuilding them.
+
+    Returns:
+        dict: 'navigable' -> raster file, 'layers' -> layer name -> file,
+            'tensors' -> environment key -> file.
+    """
+    env = engine._environment(date)
+    files = {"navigable": os.path.join(directory, "navigable.npy"), "layers": {}, "tensors": {}}
+    np.save(files["navigable"], engine.navigable)
+    for name, grid in env["field"].layers.items():
+        files["layers"][name] = os.path.join(directory, f"{name}.npy")
+        np.save(files["layers"][name], grid)
+    tensors = {"alignment": env["alignment"]}
+    tensors.update((key, grid) for key, grid in env.items() if isinstance(key, tuple) and key[0] == "edge_costs")
+    for key, grid in tensors.items():
+        name = key if isinstance(key, str) else "_".join(key)
+        files["tensors"][key] = os.path.join(directory, f"{name}.npy")
+        np.save(files["tensors"][key], grid)
+    return files
+
+
+def _init_worker(files, date):
+    """Build this worker's engine on memory-mapped copies of the parent's layers and tensors."""
+    global _worker_engine
+    layers = {name: np.load(path, mmap_mode='r') for name, path in files["layers"].items()}
+    tensors = {key: np.load(path, mmap_mode='r') for key, path in files["tensors"].items()}
+    navigable = np.load(files["navigable"], mmap_mode='r')
+    _worker_engine = RouteEngine(date, navigable=navigable, fields=[EnvironmentField(layers, date)],
+                                 tensors={date: tensors})
+
+
+def _route_job(index, start, end, mode, date, algorithm, include_explored, options):
+    result = _worker_engine.route(start, end, mode, date=date, algorithm=algorithm, **options)
+    return index, result.path, result.explored if include_explored else [], result.stats
+
+
+def route_batch(jobs, engine=None, date=DEFAULT_DATE, algorithm="astar", workers=None,
+                include_explored=False, **options):
+    """
+    Route many voyages in parallel, yielding each result as soon as it is ready.
+
+    Args:
+        jobs (list): (start, end, mode) tuples, cells as (grid_x, grid_y).
+        engine (RouteEngine): Engine whose data the workers share; created if None.
+        date (str): Environment date to route on.
+        algorithm (str): Search algorithm, a key of SEARCH_ALGORITHMS.
+        workers (int): Number of worker processes; defaults to the CPU count.
+        include_explored (bool): Also send back the expanded cells (large).
+        **options: Extra keyword arguments for the chosen algorithm.
+
+    Yields:
+        tuple: (index into jobs, RouteResult), in completion order.
+    """
+    if engine is None:
+        engine = RouteEngine(date)
+    jobs = list(jobs)
+    # Build per-mode caches (e.g. the HPA* graph file) once here, not in every worker
+    for mode in {mode for _, _, mode in jobs}:
+        engine._search_inputs(algorithm, date, mode)
+    with tempfile.TemporaryDirectory(prefix="sih_layers_") as directory:
+        files = export_layers(engine, date, directory)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(files, date)) as pool:
+            futures = [pool.submit(_route_job, index, tuple(start), tuple(end), mode, date, algorithm,
+                                   include_explored, options)
+                       for index, (start, end, mode) in enumerate(jobs)]
+            for future in as_completed(futures):
+                index, path, explored, stats = future.result()
+                yield index, RouteResult(path, explored, stats)
+
+
+def read_jobs(csv_file):
+    """Read jobs from a CSV with start_x, start_y, end_x, end_y and mode columns."""
+    with open(csv_file, newline='') as f:
+        return [((int(row['start_x']), int(row['start_y'])), (int(row['end_x']), int(row['end_y'])), row['mode'])
+                for row in csv.DictReader(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Route a batch of voyages in parallel.")
+    parser.add_argument("jobs", help="CSV with start_x, start_y, end_x, end_y and mode columns")
+    parser.add_argument("--output", default="batch_routes.jsonl", help="JSON lines file, one route per line")
+    parser.add_argument("--date", default=DEFAULT_DATE)
+    parser.add_argument("--algorithm", default="astar")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    jobs = read_jobs(args.jobs)
+    with open(args.output, 'w') as out:
+        for done, (index, result) in enumerate(route_batch(jobs, date=args.date, algorithm=args.algorithm,
+                                                           workers=args.workers), 1):
+            start, end, mode = jobs[index]
+            out.write(json.dumps({"job": index, "start": start, "end": end, "mode": mode,
+                                  "path": result.path, "stats": result.stats}) + "\n")
+            print(f"[{done}/{len(jobs)}] job {index}: {result.stats['path_cells']} cells, "
+                  f"{result.stats['elapsed']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
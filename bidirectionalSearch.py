@@ -0,0 +1,150 @@
+"""
+Bidirectional A* search.
+
+A forward frontier grows from the start towards the end and a backward frontier
+grows from the end towards the start, each using the calculate_fscore priority
+aimed at the other endpoint. The backward search walks moves in reverse, so a
+move from p into c is scored with the wind/current multiplier of the forward
+move p -> c and both frontiers see the same environment. The route is joined
+at the best meeting cell once some cell has been closed from both sides.
+"""
+import math
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, STEP_LENGTHS, a_star_search
+
+
+def bidirectional_search(navigable, start, end, weights, heuristic, alignment, on_expand=None, compare=False):
+    """
+    Run bidirectional A* from start to end.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        compare (bool): Also run the unidirectional search and report the expansions saved.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict)
+    """
+    rows, cols = navigable.shape
+    size = rows * cols
+    g_weight, distance_weight, heuristic_weight = weights
+    directions = len(DIRECTIONS)
+
+    passable = navigable.tobytes()
+    h_values = memoryview(np.ascontiguousarray(heuristic, dtype=np.float32).reshape(-1))
+    multipliers = memoryview(np.ascontiguousarray(alignment, dtype=np.float32).reshape(-1))
+    moves = [(k, dx, dy, dy * cols + dx, step) for k, ((dx, dy), step) in enumerate(zip(DIRECTIONS, STEP_LENGTHS))]
+
+    start_id = start[1] * cols + start[0]
+    end_id = end[1] * cols + end[0]
+
+    # Index 0 is the forward search (towards end), 1 the backward search (towards start)
+    targets = (end, start)
+    g_score = (array('f', [math.inf]) * size, array('f', [math.inf]) * size)
+    parent = (array('i', [-1]) * size, array('i', [-1]) * size)
+    closed = (bytearray(size), bytearray(size))
+    heaps = ([(0.0, start_id)], [(0.0, end_id)])
+    g_score[0][start_id] = 0.0
+    g_score[1][end_id] = 0.0
+
+    explored = []
+    expanded = [0, 0]
+    pushes = 2
+    stale_pops = 0
+    peak_open = 2
+    best_cost = 0.0 if start_id == end_id else math.inf
+    meeting_id = start_id if start_id == end_id else -1
+
+    while heaps[0] and heaps[1] and start_id != end_id:
+        # Grow the smaller frontier
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, cell_id = heappop(heaps[side])
+        if closed[side][cell_id]:
+            stale_pops += 1
+            continue
+        closed[side][cell_id] = 1
+        expanded[side] += 1
+
+        y, x = divmod(cell_id, cols)
+        if cell_id != start_id and cell_id != end_id:
+            explored.append((x, y))
+            if on_expand is not None:
+                on_expand((x, y))
+
+        # Once a cell is settled from both sides the frontiers have met
+        if closed[1 - side][cell_id]:
+            break
+
+        target_x, target_y = targets[side]
+        own_g, own_parent, own_closed, heap = g_score[side], parent[side], closed[side], heaps[side]
+        other_g = g_score[1 - side]
+        g = own_g[cell_id]
+        for k, dx, dy, offset, step in moves:
+            if side == 1:
+                # Backward: step to the predecessor p = cell - d_k, scored as the forward move p -> cell
+                dx, dy, offset = -dx, -dy, -offset
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            neighbor_id = cell_id + offset
+            if not passable[neighbor_id] or own_closed[neighbor_id]:
+                continue
+            tentative_g = g + step
+            if tentative_g < own_g[neighbor_id]:
+                own_g[neighbor_id] = tentative_g
+                own_parent[neighbor_id] = cell_id
+                multiplier = multipliers[(cell_id if side == 0 else neighbor_id) * directions + k]
+                f_score = (g_weight * tentative_g
+                           + distance_weight * math.hypot(nx - target_x, ny - target_y)
+                           + heuristic_weight * h_values[neighbor_id]) * multiplier
+                heappush(heap, (f_score, neighbor_id))
+                pushes += 1
+                total = tentative_g + other_g[neighbor_id]
+                if total < best_cost:
+                    best_cost = total
+                    meeting_id = neighbor_id
+        open_size = len(heaps[0]) + len(heaps[1])
+        if open_size > peak_open:
+            peak_open = open_size
+
+    stats = {
+        "expanded": len(explored),
+        "forward_expanded": expanded[0],
+        "backward_expanded": expanded[1],
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "distance": float(best_cost),
+    }
+    if compare:
+        _, unidirectional_explored, _ = a_star_search(navigable, start, end, weights, heuristic, alignment)
+        stats["unidirectional_expanded"] = len(unidirectional_explored)
+        stats["expansions_saved"] = len(unidirectional_explored) - len(explored)
+
+    if meeting_id < 0:
+        return None, explored, stats
+
+    # Forward half: start -> meeting cell
+    path = []
+    cell_id = meeting_id
+    while cell_id != start_id:
+        y, x = divmod(cell_id, cols)
+        path.append((x, y))
+        cell_id = parent[0][cell_id]
+    path.reverse()
+    # Backward half: meeting cell -> end
+    cell_id = meeting_id
+    while cell_id != end_id:
+        cell_id = parent[1][cell_id]
+        y, x = divmod(cell_id, cols)
+        path.append((x, y))
+    return path, explored, stats
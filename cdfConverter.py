@@ -1,7 +1,14 @@
+import argparse
 import netCDF4 as nc
 import pandas as pd
 import numpy as np
 
+from depthCells import latitude_to_grid, longitude_to_grid, round_latitude, round_longitude
+from CoordConv import GRID_COLS, GRID_ROWS
+
+STATS_FILE = "depth_stats.npz"
+
+
 def netcdf_to_csv(nc_file, csv_file):
     # Open the NetCDF file
     dataset = nc.Dataset(nc_file)
@@ -39,7 +46,122 @@ def netcdf_to_csv(nc_file, csv_file):
     print(f"CSV file saved to: {csv_file}")
 
 
-# Example usage
-nc_file = "gebco_2024_n20.632_s10.437_w79.321_e86.616.nc"  # Replace with your NetCDF file path
-csv_file = "output_depth_data.csv"  # Output CSV file
-netcdf_to_csv(nc_file, csv_file)
+def _runs(grid_index):
+    """
+    Split a monotone axis-to-grid mapping into runs of equal grid index.
+
+    Returns:
+        tuple: (start of each run, grid index of each run)
+    """
+    starts = np.flatnonzero(np.r_[True, grid_index[1:] != grid_index[:-1]])
+    return starts, grid_index[starts]
+
+
+def accumulate_depth_stats(latitudes, longitudes, elevation, chunk_rows=1024, chunk_cols=4096):
+    """
+    Reduce a bathymetry grid to min / mean / max depth per routing cell.
+
+    The elevation array is read one window at a time, so only a single
+    chunk_rows x chunk_cols block is ever in memory. Latitudes and longitudes are
+    snapped to grid cells exactly like depthCells.build_depth_raster does.
+
+    Args:
+        latitudes (array-like): 1-D latitude axis of the elevation grid.
+        longitudes (array-like): 1-D longitude axis of the elevation grid.
+        elevation: 2-D (lat, lon) array or NetCDF variable supporting slicing.
+        chunk_rows (int): Latitude rows per window.
+        chunk_cols (int): Longitude columns per window.
+
+    Returns:
+        dict: 'min', 'mean', 'max' float32 rasters (NaN without data) and 'count'.
+    """
+    # Grid cell of every row and column of the source grid (1-D, cheap)
+    grid_y = np.array([latitude_to_grid(round_latitude(float(lat))) for lat in np.asarray(latitudes)])
+    grid_x = np.array([longitude_to_grid(round_longitude(float(lon))) for lon in np.asarray(longitudes)])
+
+    depth_min = np.full((GRID_ROWS, GRID_COLS), np.inf)
+    depth_max = np.full((GRID_ROWS, GRID_COLS), -np.inf)
+    depth_sum = np.zeros((GRID_ROWS, GRID_COLS))
+    depth_count = np.zeros((GRID_ROWS, GRID_COLS), dtype=np.int64)
+
+    for r0 in range(0, len(grid_y), chunk_rows):
+        r1 = min(r0 + chunk_rows, len(grid_y))
+        row_starts, row_cells = _runs(grid_y[r0:r1])
+        for c0 in range(0, len(grid_x), chunk_cols):
+            c1 = min(c0 + chunk_cols, len(grid_x))
+            col_starts, col_cells = _runs(grid_x[c0:c1])
+
+            block = np.ma.filled(np.ma.masked_invalid(np.ma.asarray(elevation[r0:r1, c0:c1], dtype=float)), np.nan)
+            valid = ~np.isnan(block)
+
+            # Rows and columns map monotonically to cells, so each cell is a
+            # rectangle of the block and reduceat collapses it in one pass
+            def reduce(ufunc, values):
+                return ufunc.reduceat(ufunc.reduceat(values, row_starts, axis=0), col_starts, axis=1)
+
+            block_min = reduce(np.minimum, np.where(valid, block, np.inf))
+            block_max = reduce(np.maximum, np.where(valid, block, -np.inf))
+            block_sum = reduce(np.add, np.where(valid, block, 0.0))
+            block_count = reduce(np.add, valid.astype(np.int64))
+
+            # Keep only cells that fall on the routing grid
+            rows_in = (row_cells >= 0) & (row_cells < GRID_ROWS)
+            cols_in = (col_cells >= 0) & (col_cells < GRID_COLS)
+            target = np.ix_(row_cells[rows_in], col_cells[cols_in])
+            source = np.ix_(np.flatnonzero(rows_in), np.flatnonzero(cols_in))
+            # Distinct runs can still share a cell across window edges, hence the element-wise merge
+            np.minimum.at(depth_min, target, block_min[source])
+            np.maximum.at(depth_max, target, block_max[source])
+            np.add.at(depth_sum, target, block_sum[source])
+            np.add.at(depth_count, target, block_count[source])
+
+    has_data = depth_count > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        depth_mean = depth_sum / depth_count
+    return {
+        "min": np.where(has_data, depth_min, np.nan).astype(np.float32),
+        "mean": np.where(has_data, depth_mean, np.nan).astype(np.float32),
+        "max": np.where(has_data, depth_max, np.nan).astype(np.float32),
+        "count": depth_count,
+    }
+
+
+def netcdf_to_depth_raster(nc_file, output_file=STATS_FILE, chunk_rows=1024, chunk_cols=4096):
+    """
+    Stream a GEBCO NetCDF extract into per-cell depth statistics.
+
+    Args:
+        nc_file (str): Path to the NetCDF file with 'lat', 'lon' and 'elevation'.
+        output_file (str): Path of the compressed .npz raster to write.
+        chunk_rows (int): Latitude rows read per window.
+        chunk_cols (int): Longitude columns read per window.
+
+    Returns:
+        dict: The rasters written to output_file.
+    """
+    with nc.Dataset(nc_file) as dataset:
+        stats = accumulate_depth_stats(dataset.variables['lat'][:], dataset.variables['lon'][:],
+                                       dataset.variables['elevation'], chunk_rows, chunk_cols)
+    np.savez_compressed(output_file, **stats)
+    print(f"Depth statistics for {int((stats['count'] > 0).sum())} cells saved to: {output_file}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a GEBCO NetCDF extract to a per-cell depth raster.")
+    parser.add_argument("nc_file", help="GEBCO NetCDF file")
+    parser.add_argument("--output", default=STATS_FILE)
+    parser.add_argument("--chunk-rows", type=int, default=1024)
+    parser.add_argument("--chunk-cols", type=int, default=4096)
+    parser.add_argument("--csv", help="Write the legacy per-sample CSV to this path instead")
+    args = parser.parse_args()
+
+    if args.csv:
+        netcdf_to_csv(args.nc_file, args.csv)
+    else:
+        netcdf_to_depth_raster(args.nc_file, args.output, args.chunk_rows, args.chunk_cols)
+
+
+if __name__ == "__main__":
+    # Example: python cdfConverter.py gebco_2024_n20.632_s10.437_w79.321_e86.616.nc
+    main()
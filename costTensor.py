@@ -0,0 +1,166 @@
+"""
+Per-cell, per-direction environmental cost multipliers.
+
+For every grid cell and each of the 8 moves in gridSearch.DIRECTIONS this holds
+the f-score multiplier for wind and current alignment, so the search reads it
+in O(1) instead of doing geometry and data lookups for every neighbour. The
+same layout also carries additive move costs for the cost-based searches.
+"""
+import hashlib
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, STEP_LENGTHS
+
+# f-score multiplier applied for each of wind / current alignment
+ALIGNMENT_FACTOR = 0.9
+# Half-width of the alignment cone in degrees
+ALIGNMENT_RANGE = 25
+
+# Criteria kept apart by objective_tensor
+OBJECTIVES = ("distance", "exposure", "penalty")
+
+# Heading of each move in degrees, as round(degrees(atan2(dy, dx))) % 360
+MOVE_ANGLES = np.round(np.degrees(np.arctan2([dy for _, dy in DIRECTIONS], [dx for dx, _ in DIRECTIONS]))) % 360
+
+
+def destination_values(grid, k, fill):
+    """
+    Value of a grid at the destination of move k, for every source cell.
+
+    Args:
+        grid (np.ndarray): Any (rows, cols) array.
+        k (int): Index into DIRECTIONS.
+        fill: Value for moves that leave the grid.
+
+    Returns:
+        np.ndarray: Array of the same shape, out[y, x] = grid[y + dy, x + dx].
+    """
+    rows, cols = grid.shape
+    dx, dy = DIRECTIONS[k]
+    out = np.full(grid.shape, fill, dtype=grid.dtype)
+    out[max(0, -dy):rows - max(0, dy), max(0, -dx):cols - max(0, dx)] = \
+        grid[max(0, dy):rows - max(0, -dy), max(0, dx):cols - max(0, -dx)]
+    return out
+
+
+def alignment_mask(direction_grid):
+    """
+    Check every move against a direction field.
+
+    Entry [y, x, k] is True when move k out of (x, y) heads within
+    ALIGNMENT_RANGE degrees of the direction at the destination cell.
+
+    Args:
+        direction_grid (np.ndarray): Directions in degrees, shape (GRID_ROWS, GRID_COLS).
+
+    Returns:
+        np.ndarray: Boolean array of shape (GRID_ROWS, GRID_COLS, 8).
+    """
+    aligned = np.zeros(direction_grid.shape + (len(DIRECTIONS),), dtype=bool)
+    for k in range(len(DIRECTIONS)):
+        # NaN marks moves off the grid and never counts as aligned
+        destination = destination_values(direction_grid.astype(np.float64), k, np.nan)
+        with np.errstate(invalid="ignore"):
+            aligned[:, :, k] = np.mod(MOVE_ANGLES[k] - destination + ALIGNMENT_RANGE, 360) <= 2 * ALIGNMENT_RANGE
+    return aligned
+
+
+def build_alignment_tensor(wind_direction, current_direction):
+    """
+    Combine wind and current alignment into f-score multipliers.
+
+    Args:
+        wind_direction (np.ndarray): Wind directions in degrees, shape (GRID_ROWS, GRID_COLS).
+        current_direction (np.ndarray): Current directions in degrees, same shape.
+
+    Returns:
+        np.ndarray: Float32 array of shape (GRID_ROWS, GRID_COLS, 8); 1.0, 0.9 or 0.81 per move.
+    """
+    tensor = np.ones(wind_direction.shape + (len(DIRECTIONS),), dtype=np.float32)
+    tensor[alignment_mask(wind_direction)] *= ALIGNMENT_FACTOR
+    tensor[alignment_mask(current_direction)] *= ALIGNMENT_FACTOR
+    return tensor
+
+
+def edge_cost_tensor(weights, heuristic, alignment, navigable):
+    """
+    Additive cost of every move, for searches that need a consistent path cost.
+
+    calculate_fscore mixes path length, the per-cell heuristic and the alignment
+    bonus into a priority. As a path cost the same terms become
+    (g_weight + heuristic_weight * h(destination)) * step length * alignment,
+    so distance and heuristic exposure accumulate along the route and aligned
+    moves are cheaper. A mode with both weights at zero falls back to plain
+    distance.
+
+    Args:
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) alignment multipliers.
+        navigable (np.ndarray): Boolean (rows, cols) raster.
+
+    Returns:
+        np.ndarray: Float32 array of shape (rows, cols, 8); inf where the move
+        leaves the grid or enters a non-navigable cell.
+    """
+    g_weight, _, heuristic_weight = weights
+    if g_weight == 0 and heuristic_weight == 0:
+        g_weight = 1.0
+    heuristic = np.asarray(heuristic, dtype=np.float32)
+    costs = np.empty(alignment.shape, dtype=np.float32)
+    for k, step in enumerate(STEP_LENGTHS):
+        exposure = destination_values(heuristic, k, np.float32(0))
+        enterable = destination_values(np.asarray(navigable, dtype=bool), k, False)
+        costs[:, :, k] = np.where(enterable, (g_weight + heuristic_weight * exposure) * step * alignment[:, :, k], np.inf)
+    return costs
+
+
+def objective_tensor(heuristic, alignment, navigable):
+    """
+    Separate move costs for each of OBJECTIVES, for multi-objective search.
+
+    Instead of mixing them with one mode's weights, every move carries its
+    distance (step length), heuristic exposure (h(destination) * step) and
+    wind/current penalty (step scaled from 0 when fully aligned with both wind
+    and current to 1 when aligned with neither).
+
+    Args:
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) alignment multipliers.
+        navigable (np.ndarray): Boolean (rows, cols) raster.
+
+    Returns:
+        np.ndarray: Float32 array of shape (rows, cols, 8, len(OBJECTIVES)); inf
+        where the move leaves the grid or enters a non-navigable cell.
+    """
+    heuristic = np.asarray(heuristic, dtype=np.float32)
+    fully_aligned = ALIGNMENT_FACTOR ** 2
+    costs = np.empty(alignment.shape + (len(OBJECTIVES),), dtype=np.float32)
+    for k, step in enumerate(STEP_LENGTHS):
+        exposure = destination_values(heuristic, k, np.float32(0))
+        enterable = destination_values(np.asarray(navigable, dtype=bool), k, False)
+        # float32 holds 0.9 * 0.9 as slightly less than 0.81; keep the penalty non-negative
+        penalty = np.maximum((alignment[:, :, k] - fully_aligned) / (1 - fully_aligned), 0)
+        for i, value in enumerate((np.ones_like(exposure), exposure, penalty)):
+            costs[:, :, k, i] = np.where(enterable, value * step, np.inf)
+    return costs
+
+
+def lower_bound_scale(edge_costs):
+    """
+    Smallest cost per unit of distance over all finite moves.
+
+    Multiplying a straight-line distance by this never overestimates the cost
+    of reaching a cell, so it gives an admissible A* heuristic.
+    """
+    per_unit = edge_costs / np.asarray(STEP_LENGTHS, dtype=np.float32)
+    finite = per_unit[np.isfinite(per_unit)]
+    return float(finite.min()) if finite.size else 0.0
+
+
+def cost_signature(edge_costs, *parts):
+    """Hash a cost tensor plus any extra build parameters, for on-disk caches."""
+    digest = hashlib.sha1(np.ascontiguousarray(edge_costs).tobytes())
+    digest.update(repr((edge_costs.shape,) + parts).encode())
+    return digest.hexdigest()
@@ -1,11 +1,23 @@
+import os
 import pickle
-import pandas as pd
+import numpy as np
+
+# Coordinates are matched at the 3 decimals round_latitude / round_longitude produce
+COORDINATE_SCALE = 1000
+
+
+def _scaled(values):
+    return np.round(np.asarray(values, dtype=float) * COORDINATE_SCALE).astype(np.int64)
+
 
 class OceanCurrentRetriever:
     def __init__(self, pkl_file='filtered_data_with_angle.pkl'):
         """
         Initialize the retriever and load the data from the provided pickle file.
 
+        The Angle, U_Current and V_Current columns are laid out once on the
+        (latitude, longitude) lattice of the data, so lookups are array indexing.
+
         Args:
         pkl_file (str): Path to the pickle file containing the ocean current data.
         """
@@ -13,6 +25,48 @@ class OceanCurrentRetriever:
         with open(pkl_file, 'rb') as f:
             self.data = pickle.load(f)
 
+        lon_keys = _scaled(self.data['Longitude'].values)
+        lat_keys = _scaled(self.data['Latitude'].values)
+        self.lon_axis = np.unique(lon_keys)
+        self.lat_axis = np.unique(lat_keys)
+        cols = np.searchsorted(self.lon_axis, lon_keys)
+        rows = np.searchsorted(self.lat_axis, lat_keys)
+
+        # Keep the first row per coordinate, like the old DataFrame filter did
+        _, first_rows = np.unique(rows * len(self.lon_axis) + cols, return_index=True)
+        rows, cols = rows[first_rows], cols[first_rows]
+
+        shape = (len(self.lat_axis), len(self.lon_axis))
+        self.has_data = np.zeros(shape, dtype=bool)
+        self.has_data[rows, cols] = True
+        self.angle = np.zeros(shape)
+        self.u_current = np.zeros(shape)
+        self.v_current = np.zeros(shape)
+        self.angle[rows, cols] = self.data['Angle'].values[first_rows]
+        self.u_current[rows, cols] = self.data['U_Current'].values[first_rows]
+        self.v_current[rows, cols] = self.data['V_Current'].values[first_rows]
+        self.speed = np.hypot(self.u_current, self.v_current)
+
+        # Axis positions for scalar lookups
+        self.lon_index = {key: i for i, key in enumerate(self.lon_axis.tolist())}
+        self.lat_index = {key: i for i, key in enumerate(self.lat_axis.tolist())}
+
+    def _cell(self, longitude, latitude):
+        col = self.lon_index.get(round(longitude * COORDINATE_SCALE))
+        row = self.lat_index.get(round(latitude * COORDINATE_SCALE))
+        if col is None or row is None or not self.has_data[row, col]:
+            return None
+        return row, col
+
+    def _cells(self, longitudes, latitudes):
+        lon_keys, lat_keys = np.broadcast_arrays(_scaled(longitudes), _scaled(latitudes))
+        cols = np.minimum(np.searchsorted(self.lon_axis, lon_keys), max(len(self.lon_axis) - 1, 0))
+        rows = np.minimum(np.searchsorted(self.lat_axis, lat_keys), max(len(self.lat_axis) - 1, 0))
+        if self.has_data.size == 0:
+            return rows, cols, np.zeros(lon_keys.shape, dtype=bool)
+        found = (self.lon_axis[cols] == lon_keys) & (self.lat_axis[rows] == lat_keys) & self.has_data[rows, cols]
+        return rows, cols, found
+
     def retrieve_angle(self, longitude, latitude):
         """
         Retrieve the Angle based on latitude and longitude.
@@ -24,21 +78,82 @@ class OceanCurrentRetriever:
         Returns:
         float: The Angle value if found, otherwise returns 0.
         """
-        # Filter the data based on the provided longitude and latitude
-        result = self.data[(self.data['Longitude'] == longitude) & (self.data['Latitude'] == latitude)]
-
-        # Check if data is found and return the Angle or default to 0
-        if not result.empty:
-            return result['Angle'].values[0]
-        else:
+        cell = self._cell(longitude, latitude)
+        if cell is None:
             return 0  # Default value
+        return self.angle[cell]
+
+    def retrieve_angles(self, longitudes, latitudes, default=0.0):
+        """
+        Retrieve current directions for many coordinates in one vectorized call.
+
+        Args:
+        longitudes (array-like): Longitude of each point.
+        latitudes (array-like): Latitude of each point, broadcastable with longitudes.
+        default (float): Value for points without data.
+
+        Returns:
+        np.ndarray: Angle in degrees for each point.
+        """
+        rows, cols, found = self._cells(longitudes, latitudes)
+        if not found.any():
+            return np.full(found.shape, default)
+        return np.where(found, self.angle[rows, cols], default)
+
+    def retrieve_speeds(self, longitudes, latitudes, default=0.0):
+        """
+        Retrieve current speeds (magnitude of U/V) for many coordinates at once.
+
+        Args:
+        longitudes (array-like): Longitude of each point.
+        latitudes (array-like): Latitude of each point, broadcastable with longitudes.
+        default (float): Value for points without data.
+
+        Returns:
+        np.ndarray: Current speed for each point.
+        """
+        rows, cols, found = self._cells(longitudes, latitudes)
+        if not found.any():
+            return np.full(found.shape, default)
+        return np.where(found, self.speed[rows, cols], default)
+
+    def retrieve_components(self, longitudes, latitudes, default=0.0):
+        """
+        Retrieve U and V current components for many coordinates at once.
+
+        Returns:
+        tuple: (U_Current, V_Current) arrays, default where there is no data.
+        """
+        rows, cols, found = self._cells(longitudes, latitudes)
+        if not found.any():
+            return np.full(found.shape, default), np.full(found.shape, default)
+        return (np.where(found, self.u_current[rows, cols], default),
+                np.where(found, self.v_current[rows, cols], default))
+
+
+_shared_retrievers = {}
+
+
+def get_shared_retriever(pkl_file='filtered_data_with_angle.pkl'):
+    """
+    Return the process-wide retriever for a pickle file, loading it on first use.
+
+    The file's size and modification time are checked on every call, so a
+    regenerated pickle is picked up instead of serving the old data.
+    """
+    stat = os.stat(pkl_file)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _shared_retrievers.get(pkl_file)
+    if cached is None or cached[0] != signature:
+        _shared_retrievers[pkl_file] = (signature, OceanCurrentRetriever(pkl_file))
+    return _shared_retrievers[pkl_file][1]
 
-# Instantiate the retriever
-ocean_retriever = OceanCurrentRetriever()
 
-# Example usage
-longitude = 68.5
-latitude = 5.0
-angle = ocean_retriever.retrieve_angle(longitude, latitude)
+if __name__ == '__main__':
+    # Example usage
+    ocean_retriever = get_shared_retriever()
+    longitude = 68.5
+    latitude = 5.0
+    angle = ocean_retriever.retrieve_angle(longitude, latitude)
 
-print(f"Angle for Longitude: {longitude}, Latitude: {latitude}: {angle}°")
+    print(f"Angle for Longitude: {longitude}, Latitude: {latitude}: {angle}°")
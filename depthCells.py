@@ -1,6 +1,18 @@
+import argparse
 import csv
 import pickle
 import os
+import numpy as np
+from CoordConv import GRID_COLS, GRID_ROWS
+
+# Depth reported for cells with no shallow-water record
+DEFAULT_DEPTH = -50
+# Samples shallower than this are recorded against their cell
+SHALLOW_DEPTH = -40
+
+CSV_FILE = "output_depth_data.csv"
+LEGACY_STORAGE_FILE = "lat_long_data.pkl"
+DEPTH_RASTER_FILE = "depth_grid.npy"
 
 # Function to convert latitude to grid y-coordinate
 def latitude_to_grid(latitude):
@@ -34,82 +46,77 @@ def round_longitude(longitude):
     rounded_longitude = round((longitude - 0.125) / 0.250) * 0.250 + 0.125
     return round(rounded_longitude, 3)
 
-# Function to process the CSV and filter by depth, storing results persistently in a pickle file
-def process_csv(file_path, storage_file="lat_long_data.pkl"):
-    # Check if the data is already saved in the pickle file
-    if os.path.exists(storage_file):
-        # Load the pre-calculated data from the pickle file
-        with open(storage_file, 'rb') as file:
+# Build the depth raster on the routing grid from the bathymetry CSV, cdfConverter's
+# depth_stats.npz, or the legacy pickle
+def build_depth_raster(source=CSV_FILE, raster_file=DEPTH_RASTER_FILE):
+    depth_grid = np.full((GRID_ROWS, GRID_COLS), DEFAULT_DEPTH, dtype=np.float32)
+
+    if source.endswith(".npz"):
+        # Per-cell statistics from cdfConverter: the shallowest sample decides, as in the CSV path
+        with np.load(source) as stats:
+            shallowest = stats["max"]
+        shallow = shallowest > SHALLOW_DEPTH  # NaN (no data) compares False
+        depth_grid[shallow] = shallowest[shallow]
+    elif source.endswith(".pkl"):
+        with open(source, 'rb') as file:
             lat_long_dict = pickle.load(file)
-        print("Loaded data from pickle file.")
+        for coordinate_key, depth in lat_long_dict.items():
+            grid_x, grid_y = (int(v) for v in coordinate_key.split(","))
+            if 0 <= grid_x < GRID_COLS and 0 <= grid_y < GRID_ROWS:
+                depth_grid[grid_y, grid_x] = depth
     else:
-        # Initialize a dictionary to store the latitude and longitude
-        lat_long_dict = {}
-
-        # Open the CSV file and read its contents
-        with open(file_path, mode='r') as file:
+        with open(source, mode='r') as file:
             reader = csv.reader(file)
             next(reader)  # Skip the header line
-
-            # Iterate through the rows in the CSV file
             for row in reader:
-                latitude = float(row[0])  # Convert latitude to float
-                longitude = float(row[1])  # Convert longitude to float
-                depth = float(row[2])  # Convert depth to float
-
-                # If depth is greater than -40, store the lat/long in the dictionary
-                if depth > -40:
-                    # Round and convert latitude and longitude to grid coordinates
-                    rounded_lat = round_latitude(latitude)
-                    rounded_long = round_longitude(longitude)
-
-                    grid_y = latitude_to_grid(rounded_lat)
-                    grid_x = longitude_to_grid(rounded_long)
-
-                    # Create a unique key using grid coordinates
-                    coordinate_key = f"{grid_x},{grid_y}"
-
-                    # Store the depth in the dictionary using grid coordinates as the key
-                    lat_long_dict[coordinate_key] = depth
-
-        # After processing, save the data to a pickle file for future use
-        with open(storage_file, 'wb') as file:
-            pickle.dump(lat_long_dict, file)
-        print("Data processed and saved to pickle file.")
-
-    return lat_long_dict
+                depth = float(row[2])
+                # Only shallow water is recorded; deeper cells keep DEFAULT_DEPTH
+                if depth > SHALLOW_DEPTH:
+                    grid_y = latitude_to_grid(round_latitude(float(row[0])))
+                    grid_x = longitude_to_grid(round_longitude(float(row[1])))
+                    if 0 <= grid_x < GRID_COLS and 0 <= grid_y < GRID_ROWS:
+                        depth_grid[grid_y, grid_x] = depth
+
+    np.save(raster_file, depth_grid)
+    print(f"Depth raster saved to {raster_file}")
+    return depth_grid
+
+# Memory-mapped depth rasters, opened on first access
+_depth_rasters = {}
+
+def load_depth_grid(raster_file=DEPTH_RASTER_FILE):
+    if raster_file not in _depth_rasters:
+        if not os.path.exists(raster_file):
+            if os.path.exists(LEGACY_STORAGE_FILE):
+                build_depth_raster(LEGACY_STORAGE_FILE, raster_file)
+            else:
+                print("No depth raster found. Run 'python depthCells.py build' first.")
+                return np.full((GRID_ROWS, GRID_COLS), DEFAULT_DEPTH, dtype=np.float32)
+        _depth_rasters[raster_file] = np.load(raster_file, mmap_mode='r')
+    return _depth_rasters[raster_file]
 
 # Retriever function: Get the depth for a specific grid coordinate
-def retrieve_depth(grid_x, grid_y, storage_file="lat_long_data.pkl"):
-    # Check if the data is available in the pickle file
-    if os.path.exists(storage_file):
-        with open(storage_file, 'rb') as file:
-            lat_long_dict = pickle.load(file)
-        
-        # Create the key for the coordinate
-        coordinate_key = f"{grid_x},{grid_y}"
-        
-        # Retrieve the depth for the specified coordinates
-        if coordinate_key in lat_long_dict:
-            return lat_long_dict[coordinate_key]
-        else:
-            return -50  # No depth data found for the coordinate
+def retrieve_depth(grid_x, grid_y, raster_file=DEPTH_RASTER_FILE):
+    depth_grid = load_depth_grid(raster_file)
+    if 0 <= grid_x < GRID_COLS and 0 <= grid_y < GRID_ROWS:
+        return float(depth_grid[grid_y, grid_x])
+    return DEFAULT_DEPTH  # No depth data found for the coordinate
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the depth raster.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build the depth raster from the bathymetry CSV")
+    build.add_argument("--source", default=CSV_FILE, help="Bathymetry CSV, depth_stats.npz or the legacy lat_long_data.pkl")
+    build.add_argument("--output", default=DEPTH_RASTER_FILE)
+    query = subparsers.add_parser("query", help="Print the depth of a grid cell")
+    query.add_argument("grid_x", type=int)
+    query.add_argument("grid_y", type=int)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_depth_raster(args.source, args.output)
     else:
-        print("No data found. Please process the CSV first.")
-        return -50
-
-# Specify the file path for the CSV
-file_path = "output_depth_data.csv"  # Update with your CSV file path
-
-# Process the CSV and get the dictionary of latitudes and longitudes
-lat_long_dict = process_csv(file_path)
-
-# Example: Access the depth value for a specific grid coordinate (grid_x, grid_y)
-grid_x = 56
-grid_y = 125   
-depth_value = retrieve_depth(grid_x, grid_y)
+        print(f"Depth at ({args.grid_x}, {args.grid_y}): {retrieve_depth(args.grid_x, args.grid_y)}")
 
-if depth_value is not None:
-    print(f"Depth at ({grid_x}, {grid_y}): {depth_value}")
-else:
-    print(f"No depth data found for grid coordinates ({grid_x}, {grid_y})")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
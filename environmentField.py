@@ -0,0 +1,230 @@
+"""
+Grid-aligned store for every environment layer.
+
+Wind, current, fuel efficiency, heuristic and depth data are snapped onto the
+router's (GRID_ROWS, GRID_COLS) grid once, as contiguous float32 arrays that
+share one set of coordinate metadata. Every consumer then gets O(1) scalar,
+batch or slice access from the same in-memory structure.
+"""
+import hashlib
+import os
+from datetime import date as calendar_date, timedelta
+
+import numpy as np
+
+import WindRetriever
+import currentDirRetriever
+import fuelRetriever
+from heuristicRetriever import HeuristicRetriever
+from depthCells import load_depth_grid, DEPTH_RASTER_FILE
+from CoordConv import grid_to_latitude, grid_to_longitude, round_latitude, round_longitude, GRID_COLS, GRID_ROWS
+
+# Date of the environment snapshot shipped with the repo
+DEFAULT_DATE = "2024-12-11"
+
+# Defaults the retrievers return for coordinates they have no data for
+DEFAULT_HEURISTIC = 0.38
+
+# Days of forecast Data_PreProcessing fetches ahead of the current date
+FORECAST_DAYS = 3
+
+LAYERS = ("wind_direction", "current_angle", "current_u", "current_v", "fuel_efficiency", "heuristic", "depth")
+
+
+def environment_files(date):
+    """
+    Return the environment data files used for a given date.
+
+    The snapshot shipped with the repo is DEFAULT_DATE; other dates are expected
+    next to it with the date appended to the file name, as written by
+    forecastLayers.build_forecast_layers. A date without its own heuristics
+    file uses DEFAULT_DATE's, so every day of a forecast scores cells with
+    the same model output instead of later days falling back to
+    DEFAULT_HEURISTIC.
+
+    Args:
+        date (str): Date in the format 'YYYY-MM-DD'.
+
+    Returns:
+        dict: Paths keyed by 'wind', 'current', 'heuristic', 'fuel' and 'depth'.
+    """
+    files = {
+        "fuel": "latitude_longitude_fuel_efficiency.pkl",
+        "depth": DEPTH_RASTER_FILE,
+    }
+    if date == DEFAULT_DATE:
+        files.update({
+            "wind": "longitude_latitude_wind_direction.pkl",
+            "current": "filtered_data_with_angle.pkl",
+            "heuristic": "heuristics_data.pkl",
+        })
+    else:
+        heuristic = f"heuristics_data_{date}.pkl"
+        files.update({
+            "wind": f"longitude_latitude_wind_direction_{date}.pkl",
+            "current": f"filtered_data_with_angle_{date}.pkl",
+            "heuristic": heuristic if os.path.exists(heuristic) else "heuristics_data.pkl",
+        })
+    return files
+
+
+def forecast_dates(first_date, days=FORECAST_DAYS + 1):
+    """
+    Consecutive dates from first_date onwards that have environment data.
+
+    Stops at the first date whose wind or current file is missing; first_date
+    itself is always included.
+
+    Args:
+        first_date (str): Date in the format 'YYYY-MM-DD'.
+        days (int): Maximum number of dates to return.
+
+    Returns:
+        list: Dates as 'YYYY-MM-DD' strings.
+    """
+    dates = [first_date]
+    day = calendar_date.fromisoformat(first_date)
+    for offset in range(1, days):
+        candidate = (day + timedelta(days=offset)).isoformat()
+        files = environment_files(candidate)
+        if not (os.path.exists(files["wind"]) and os.path.exists(files["current"])):
+            break
+        dates.append(candidate)
+    return dates
+
+
+def environment_version(date):
+    """
+    Hash identifying the current contents of a date's environment files.
+
+    Files are identified by size and modification time, so regenerating any of
+    the pickles (or the depth raster) changes the version.
+
+    Args:
+        date (str): Date in the format 'YYYY-MM-DD'.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha1()
+    for kind, path in sorted(environment_files(date).items()):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{kind}:{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        else:
+            digest.update(f"{kind}:{path}:missing".encode())
+    return digest.hexdigest()
+
+
+def grid_coordinates():
+    """
+    Geographic coordinates of the grid, rounded like the retrievers expect.
+
+    Returns:
+        tuple: (longitudes per column, latitudes per row) as float arrays.
+    """
+    longitudes = np.array([round_longitude(grid_to_longitude(x)) for x in range(GRID_COLS)])
+    latitudes = np.array([round_latitude(grid_to_latitude(y)) for y in range(GRID_ROWS)])
+    return longitudes, latitudes
+
+
+def sample_on_grid(longitudes, latitudes, values, default=0.0):
+    """
+    Snap point data onto the grid by exact coordinate match.
+
+    Args:
+        longitudes (array-like): Longitude of each data point.
+        latitudes (array-like): Latitude of each data point.
+        values (array-like): Value of each data point.
+        default (float): Value for cells without a data point.
+
+    Returns:
+        np.ndarray: Float32 array of shape (GRID_ROWS, GRID_COLS).
+    """
+    lookup = {}
+    for key, value in zip(zip(np.asarray(longitudes, dtype=float).tolist(), np.asarray(latitudes, dtype=float).tolist()),
+                          np.asarray(values, dtype=float).tolist()):
+        lookup.setdefault(key, value)  # first match wins, as in the retrievers
+    grid_longitudes, grid_latitudes = grid_coordinates()
+    return np.array([[lookup.get((lon, lat), default) for lon in grid_longitudes.tolist()]
+                     for lat in grid_latitudes.tolist()], dtype=np.float32)
+
+
+class EnvironmentField:
+    """
+    All environment layers for one date, on the routing grid.
+
+    Layers are float32 arrays of shape (GRID_ROWS, GRID_COLS) indexed [y, x].
+    longitudes[x] and latitudes[y] give the geographic coordinate of each cell.
+    """
+
+    def __init__(self, layers, date=DEFAULT_DATE):
+        self.date = date
+        self.longitudes, self.latitudes = grid_coordinates()
+        self.shape = (GRID_ROWS, GRID_COLS)
+        self.layers = {}
+        for name, grid in layers.items():
+            grid = np.ascontiguousarray(grid, dtype=np.float32)
+            if grid.shape != self.shape:
+                raise ValueError(f"Layer {name} has shape {grid.shape}, expected {self.shape}")
+            self.layers[name] = grid
+
+    @classmethod
+    def load(cls, date=DEFAULT_DATE):
+        """
+        Build the field from the pickled environment data for a date.
+
+        Args:
+            date (str): Date in the format 'YYYY-MM-DD'.
+
+        Returns:
+            EnvironmentField: The snapped layers.
+        """
+        files = environment_files(date)
+        wind = WindRetriever.get_shared_retriever(files["wind"])
+        current = currentDirRetriever.get_shared_retriever(files["current"])
+        fuel = fuelRetriever.FuelEfficiencyRetriever(files["fuel"]).data
+        heuristics = HeuristicRetriever().load_file(files["heuristic"])
+
+        longitudes, latitudes = grid_coordinates()
+        grid_lons, grid_lats = longitudes[np.newaxis, :], latitudes[:, np.newaxis]
+        current_u, current_v = current.retrieve_components(grid_lons, grid_lats)
+        layers = {
+            "wind_direction": wind.retrieve_many(grid_lons, grid_lats),
+            "current_angle": current.retrieve_angles(grid_lons, grid_lats),
+            "current_u": current_u,
+            "current_v": current_v,
+            "fuel_efficiency": sample_on_grid(fuel['Longitude'], fuel['Latitude'], fuel['fuel_efficiency']),
+            "heuristic": sample_on_grid([lon for lon, _ in heuristics], [lat for _, lat in heuristics],
+                                        list(heuristics.values()), default=DEFAULT_HEURISTIC),
+            "depth": load_depth_grid(files["depth"]),
+        }
+        return cls(layers, date)
+
+    def layer(self, name):
+        """Return the full (GRID_ROWS, GRID_COLS) array of a layer."""
+        return self.layers[name]
+
+    def value(self, name, x, y):
+        """Return a layer's value at grid cell (x, y)."""
+        return float(self.layers[name][y, x])
+
+    def values(self, name, xs, ys):
+        """
+        Return a layer's values at many grid cells at once.
+
+        Args:
+            name (str): Layer name.
+            xs (array-like): Grid x of each cell.
+            ys (array-like): Grid y of each cell.
+
+        Returns:
+            np.ndarray: One value per cell.
+        """
+        return self.layers[name][np.asarray(ys, dtype=np.intp), np.asarray(xs, dtype=np.intp)]
+
+    def window(self, name, x0, y0, x1, y1):
+        """Return a read-only view of a layer over columns x0:x1 and rows y0:y1."""
+        view = self.layers[name][y0:y1, x0:x1]
+        view.flags.writeable = False
+        return view
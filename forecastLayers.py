@@ -0,0 +1,112 @@
+"""
+Per-date environment layers from the split weather data.
+
+Data_PreProcessing.split_data_evenly writes one split_by_date/data_<date>.csv
+per forecast day. This step turns each of them into the files
+environmentField.environment_files expects for that date:
+
+- longitude_latitude_wind_direction_<date>.pkl: the day's dominant wind
+  direction, snapped to the 0.25 degree grid the retrievers match on.
+- filtered_data_with_angle_<date>.pkl: the day's rows of the merged currents
+  CSV (Date, Latitude, Longitude, U_Current, V_Current), via
+  currentDirGenerator.filter_csv_by_date_with_angle. Days the currents file
+  does not cover reuse the latest earlier current layer, as currents change
+  far more slowly than wind over a forecast window.
+
+Heuristics come from the model (Data_Training.py), not the split data, so
+no per-date heuristics file is written here; environment_files falls back to
+DEFAULT_DATE's heuristics for dates without one. The DEFAULT_DATE files
+shipped with the repo are never overwritten.
+
+    python forecastLayers.py --currents merged_data_20241211_20241216.csv
+"""
+import argparse
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from CoordConv import round_latitude, round_longitude
+from currentDirGenerator import filter_csv_by_date_with_angle
+from environmentField import DEFAULT_DATE, environment_files
+
+SPLIT_DIR = "split_by_date"
+
+
+def split_files(split_dir=SPLIT_DIR):
+    """
+    Split weather files by date.
+
+    Returns:
+        dict: Date as 'YYYY-MM-DD' -> path of its data_<date>.csv, in date order.
+    """
+    files = {}
+    for path in sorted(Path(split_dir).glob("data_*.csv")):
+        date = pd.Timestamp(path.stem[len("data_"):]).date().isoformat()
+        files[date] = str(path)
+    return files
+
+
+def write_wind_layer(split_file, output_file):
+    """
+    Save the wind directions of one day's split data as a wind pickle.
+
+    Args:
+        split_file (str): Path to a data_<date>.csv written by split_data_evenly.
+        output_file (str): Path to the pickle file to write.
+    """
+    data = pd.read_csv(split_file, usecols=["longitude", "latitude", "wind_direction_10m_dominant"])
+    data = data.dropna()
+    data["longitude"] = [round_longitude(longitude) for longitude in data["longitude"]]
+    data["latitude"] = [round_latitude(latitude) for latitude in data["latitude"]]
+    data = data.drop_duplicates(subset=["longitude", "latitude"]).reset_index(drop=True)
+    data.to_pickle(output_file)
+    print(f"Wind directions for {len(data)} points saved to {output_file}")
+
+
+def build_forecast_layers(split_dir=SPLIT_DIR, currents_file=None):
+    """
+    Write the wind and current layers for every date of the split data.
+
+    Args:
+        split_dir (str): Directory written by split_data_evenly.
+        currents_file (str): Merged currents CSV with a Date column; without
+            one, every date reuses the latest earlier current layer.
+
+    Returns:
+        list: Dates that now have both a wind and a current layer.
+    """
+    current_dates = set()
+    if currents_file is not None:
+        current_dates = set(pd.read_csv(currents_file, usecols=["Date"])["Date"].astype(str))
+
+    dates = []
+    previous_current = None
+    for date, split_file in split_files(split_dir).items():
+        files = environment_files(date)
+        if date != DEFAULT_DATE:
+            write_wind_layer(split_file, files["wind"])
+            if date in current_dates:
+                filter_csv_by_date_with_angle(currents_file, files["current"], date)
+            elif previous_current is not None:
+                shutil.copyfile(previous_current, files["current"])
+                print(f"No currents for {date}, reusing {previous_current}")
+        if os.path.exists(files["current"]):
+            previous_current = files["current"]
+            dates.append(date)
+    return dates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-date environment layers from the split weather data.")
+    parser.add_argument("--split-dir", default=SPLIT_DIR)
+    parser.add_argument("--currents", help="Merged currents CSV with Date, Latitude, Longitude, U_Current, V_Current")
+    args = parser.parse_args()
+
+    dates = build_forecast_layers(args.split_dir, args.currents)
+    print(f"Environment layers ready for {len(dates)} dates: {', '.join(dates)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import pickle
-import pandas as pd
 
 class FuelEfficiencyRetriever:
     def __init__(self, pkl_file='latitude_longitude_fuel_efficiency.pkl'):
@@ -17,7 +16,8 @@ class FuelEfficiencyRetriever:
         else:
             return 0  # Default value if coordinates are not found
 
-# Example usage
-retriever = FuelEfficiencyRetriever()  # Load the pickle file only once
-fuel_efficiency_score = retriever.retrieve_fuel_efficiency(68.875, 12.25)  # Example coordinates
-print("Fuel Efficiency Score:", fuel_efficiency_score)
+if __name__ == '__main__':
+    # Example usage
+    retriever = FuelEfficiencyRetriever()  # Load the pickle file only once
+    fuel_efficiency_score = retriever.retrieve_fuel_efficiency(68.875, 12.25)  # Example coordinates
+    print("Fuel Efficiency Score:", fuel_efficiency_score)
@@ -0,0 +1,380 @@
+"""
+Array-backed A* search core.
+
+Cells are addressed by linear id (y * cols + x). g-scores and parents live in
+flat float32 / int32 arrays, closed cells in a bitmap, and the open set is a
+plain heapq list. Stale heap entries are skipped lazily when popped, so no
+entry is ever removed or re-prioritised in place.
+
+Both A* loops time their phases (neighbour generation, heuristic, environment
+lookup, open-set queue) when given a searchMetrics.SearchMetrics; without one
+the timers are skipped by a single branch.
+"""
+import math
+import time
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+# 8-way moves, in the order get_neighbors has always used
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+STEP_LENGTHS = [math.hypot(dx, dy) for dx, dy in DIRECTIONS]
+
+
+def reconstruct_path(parent, cols, start_id, end_id):
+    """
+    Walk the parent array back from end to start.
+
+    Returns:
+        list: Cells (grid_x, grid_y) from the first step after start up to end.
+    """
+    path = []
+    cell_id = end_id
+    while cell_id != start_id:
+        y, x = divmod(cell_id, cols)
+        path.append((x, y))
+        cell_id = parent[cell_id]
+    path.reverse()
+    return path
+
+
+def path_length(start, path):
+    """Euclidean length of a path of cells walked from start."""
+    length = 0.0
+    previous = start
+    for cell in path:
+        length += math.hypot(cell[0] - previous[0], cell[1] - previous[1])
+        previous = cell
+    return length
+
+
+def a_star_search(navigable, start, end, weights, heuristic, alignment, on_expand=None, metrics=None):
+    """
+    Run A* from start to end over a navigability raster.
+
+    The priority of a cell reached with path length g is
+    (g_weight * g + distance_weight * euclidean(cell, end) + heuristic_weight * h(cell))
+    scaled by the wind/current alignment multiplier of the move, exactly as
+    calculate_fscore has always done.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        metrics (SearchMetrics): Optional collector of the time spent in
+            neighbour generation, heuristic lookup (h layer and distance to
+            end), environment lookup (alignment multipliers) and the queue.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict)
+    """
+    rows, cols = navigable.shape
+    size = rows * cols
+    g_weight, distance_weight, heuristic_weight = weights
+    end_x, end_y = end
+
+    passable = navigable.tobytes()
+    h_values = memoryview(np.ascontiguousarray(heuristic, dtype=np.float32).reshape(-1))
+    multipliers = memoryview(np.ascontiguousarray(alignment, dtype=np.float32).reshape(-1))
+    directions = len(DIRECTIONS)
+    g_score = array('f', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    moves = [(dx, dy, dy * cols + dx, step) for (dx, dy), step in zip(DIRECTIONS, STEP_LENGTHS)]
+
+    start_id = start[1] * cols + start[0]
+    end_id = end_y * cols + end_x
+    g_score[start_id] = 0.0
+    open_heap = [(0.0, start_id)]
+
+    explored = []
+    pushes = 1
+    stale_pops = 0
+    peak_open = 1
+    found = False
+    timed = metrics is not None
+    clock = time.perf_counter
+    phases = dict.fromkeys(("neighbors", "heuristic", "environment", "queue"), 0.0)
+    intervals = dict.fromkeys(phases, 0)
+
+    while open_heap:
+        if timed:
+            t0 = clock()
+            _, cell_id = heappop(open_heap)
+            phases["queue"] += clock() - t0
+            intervals["queue"] += 1
+        else:
+            _, cell_id = heappop(open_heap)
+        if closed[cell_id]:
+            stale_pops += 1
+            continue
+        closed[cell_id] = 1
+
+        y, x = divmod(cell_id, cols)
+        if cell_id != start_id and cell_id != end_id:
+            explored.append((x, y))
+            if on_expand is not None:
+                on_expand((x, y))
+
+        if cell_id == end_id:
+            found = True
+            break
+
+        if timed:
+            loop_started = clock()
+            inner_time = 0.0
+        g = g_score[cell_id]
+        base = cell_id * directions
+        for k, (dx, dy, offset, step) in enumerate(moves):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            neighbor_id = cell_id + offset
+            if not passable[neighbor_id] or closed[neighbor_id]:
+                continue
+            tentative_g = g + step
+            if tentative_g < g_score[neighbor_id]:
+                g_score[neighbor_id] = tentative_g
+                parent[neighbor_id] = cell_id
+                if timed:
+                    t0 = clock()
+                    estimate = (g_weight * tentative_g
+                                + distance_weight * math.hypot(nx - end_x, ny - end_y)
+                                + heuristic_weight * h_values[neighbor_id])
+                    t1 = clock()
+                    multiplier = multipliers[base + k]
+                    t2 = clock()
+                    heappush(open_heap, (estimate * multiplier, neighbor_id))
+                    t3 = clock()
+                    phases["heuristic"] += t1 - t0
+                    phases["environment"] += t2 - t1
+                    phases["queue"] += t3 - t2
+                    inner_time += t3 - t0
+                else:
+                    f_score = (g_weight * tentative_g
+                               + distance_weight * math.hypot(nx - end_x, ny - end_y)
+                               + heuristic_weight * h_values[neighbor_id]) * multipliers[base + k]
+                    heappush(open_heap, (f_score, neighbor_id))
+                pushes += 1
+        if timed:
+            phases["neighbors"] += clock() - loop_started - inner_time
+        if len(open_heap) > peak_open:
+            peak_open = len(open_heap)
+
+    if timed:
+        intervals["neighbors"] = len(explored) + 1
+        intervals["heuristic"] = intervals["environment"] = pushes - 1
+        intervals["queue"] += pushes - 1
+        metrics.add_search_phases(phases, intervals)
+
+    stats = {
+        "expanded": len(explored),
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "distance": float(g_score[end_id]),
+    }
+    if not found:
+        return None, explored, stats
+    return reconstruct_path(parent, cols, start_id, end_id), explored, stats
+
+
+def cost_a_star(edge_costs, start, end, heuristic_scale=0.0, allowed=None, on_expand=None, lower_bounds=None,
+                metrics=None):
+    """
+    A* over additive move costs (see costTensor.edge_cost_tensor).
+
+    With heuristic_scale at most costTensor.lower_bound_scale the straight-line
+    estimate is admissible and the route returned has the lowest total cost.
+
+    Args:
+        edge_costs (np.ndarray): (rows, cols, 8) move costs, inf where a move is not allowed.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        heuristic_scale (float): Cost per unit of straight-line distance to the end.
+        allowed (np.ndarray): Optional boolean (rows, cols) mask restricting the search.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        lower_bounds (np.ndarray): Optional (rows, cols) admissible cost estimates to
+            the end, used instead of the straight-line estimate.
+        metrics (SearchMetrics): Optional collector of the time spent in
+            neighbour generation, heuristic estimates and the queue. Wind and
+            current are folded into edge_costs beforehand, so reading them is
+            part of neighbour generation.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict with 'cost')
+    """
+    rows, cols, directions = edge_costs.shape
+    size = rows * cols
+    end_x, end_y = end
+    costs = memoryview(np.ascontiguousarray(edge_costs, dtype=np.float32).reshape(-1))
+    inside = allowed.tobytes() if allowed is not None else None
+    estimates = memoryview(np.ascontiguousarray(lower_bounds, dtype=np.float64).reshape(-1)) \
+        if lower_bounds is not None else None
+
+    g_score = array('d', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    moves = [(dx, dy, dy * cols + dx) for dx, dy in DIRECTIONS]
+
+    start_id = start[1] * cols + start[0]
+    end_id = end_y * cols + end_x
+    g_score[start_id] = 0.0
+    open_heap = [(0.0, start_id)]
+
+    explored = []
+    pushes = 1
+    stale_pops = 0
+    peak_open = 1
+    found = False
+    timed = metrics is not None
+    clock = time.perf_counter
+    phases = dict.fromkeys(("neighbors", "heuristic", "queue"), 0.0)
+    intervals = dict.fromkeys(phases, 0)
+
+    while open_heap:
+        if timed:
+            t0 = clock()
+            _, cell_id = heappop(open_heap)
+            phases["queue"] += clock() - t0
+            intervals["queue"] += 1
+        else:
+            _, cell_id = heappop(open_heap)
+        if closed[cell_id]:
+            stale_pops += 1
+            continue
+        closed[cell_id] = 1
+
+        y, x = divmod(cell_id, cols)
+        if cell_id != start_id and cell_id != end_id:
+            explored.append((x, y))
+            if on_expand is not None:
+                on_expand((x, y))
+
+        if cell_id == end_id:
+            found = True
+            break
+
+        if timed:
+            loop_started = clock()
+            inner_time = 0.0
+        g = g_score[cell_id]
+        base = cell_id * directions
+        for k, (dx, dy, offset) in enumerate(moves):
+            move_cost = costs[base + k]
+            if move_cost == math.inf:
+                continue
+            neighbor_id = cell_id + offset
+            if closed[neighbor_id] or (inside is not None and not inside[neighbor_id]):
+                continue
+            tentative_g = g + move_cost
+            if tentative_g < g_score[neighbor_id]:
+                g_score[neighbor_id] = tentative_g
+                parent[neighbor_id] = cell_id
+                if timed:
+                    t0 = clock()
+                if estimates is not None:
+                    f_score = tentative_g + estimates[neighbor_id]
+                else:
+                    f_score = tentative_g + heuristic_scale * math.hypot(x + dx - end_x, y + dy - end_y)
+                if timed:
+                    t1 = clock()
+                    heappush(open_heap, (f_score, neighbor_id))
+                    t2 = clock()
+                    phases["heuristic"] += t1 - t0
+                    phases["queue"] += t2 - t1
+                    inner_time += t2 - t0
+                else:
+                    heappush(open_heap, (f_score, neighbor_id))
+                pushes += 1
+        if timed:
+            phases["neighbors"] += clock() - loop_started - inner_time
+        if len(open_heap) > peak_open:
+            peak_open = len(open_heap)
+
+    if timed:
+        intervals["neighbors"] = len(explored) + 1
+        intervals["heuristic"] = pushes - 1
+        intervals["queue"] += pushes - 1
+        metrics.add_search_phases(phases, intervals)
+
+    stats = {
+        "expanded": len(explored),
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "cost": g_score[end_id],
+    }
+    if not found:
+        return None, explored, stats
+    return reconstruct_path(parent, cols, start_id, end_id), explored, stats
+
+
+def dijkstra(edge_costs, sources, allowed=None, targets=None, reverse=False):
+    """
+    Cheapest cost from a set of source cells to every reachable cell.
+
+    Args:
+        edge_costs (np.ndarray): (rows, cols, 8) move costs, inf where a move is not allowed.
+        sources (list): Source cells (grid_x, grid_y), all at cost 0.
+        allowed (np.ndarray): Optional boolean (rows, cols) mask restricting the search.
+        targets (list): Optional cells; the search stops once all are settled.
+        reverse (bool): Compute the cost from every cell *to* the sources instead.
+
+    Returns:
+        tuple: (costs as a float64 (rows, cols) array with inf where unreachable,
+        parent ids as an int32 (rows, cols) array pointing one step towards the sources)
+    """
+    rows, cols, directions = edge_costs.shape
+    size = rows * cols
+    costs = memoryview(np.ascontiguousarray(edge_costs, dtype=np.float32).reshape(-1))
+    inside = allowed.tobytes() if allowed is not None else None
+
+    distance = array('d', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    # Backwards, a cell is reached from its predecessor p = cell - d_k via p's move k
+    sign = -1 if reverse else 1
+    moves = [(k, sign * dx, sign * dy, sign * (dy * cols + dx)) for k, (dx, dy) in enumerate(DIRECTIONS)]
+
+    open_heap = []
+    for x, y in sources:
+        source_id = y * cols + x
+        distance[source_id] = 0.0
+        open_heap.append((0.0, source_id))
+    remaining = {y * cols + x for x, y in targets} if targets else None
+
+    while open_heap:
+        d, cell_id = heappop(open_heap)
+        if closed[cell_id]:
+            continue
+        closed[cell_id] = 1
+        if remaining is not None:
+            remaining.discard(cell_id)
+            if not remaining:
+                break
+
+        y, x = divmod(cell_id, cols)
+        for k, dx, dy, offset in moves:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            neighbor_id = cell_id + offset
+            if closed[neighbor_id] or (inside is not None and not inside[neighbor_id]):
+                continue
+            move_cost = costs[(neighbor_id if reverse else cell_id) * directions + k]
+            if move_cost == math.inf:
+                continue
+            tentative = d + move_cost
+            if tentative < distance[neighbor_id]:
+                distance[neighbor_id] = tentative
+                parent[neighbor_id] = cell_id
+                heappush(open_heap, (tentative, neighbor_id))
+
+    return (np.frombuffer(distance, dtype=np.float64).reshape(rows, cols),
+            np.frombuffer(parent, dtype=np.int32).reshape(rows, cols))
@@ -0,0 +1,271 @@
+"""
+Hierarchical pathfinding (HPA*) over clustered grid regions.
+
+The grid is cut into square clusters. Wherever two neighbouring clusters share
+a run of open border cells, the middle of the run becomes an entrance: a pair of
+abstract nodes, one on each side, joined by the move between them. Inside every
+cluster the cheapest cost between its entrance nodes is precomputed. A query
+first searches this small abstract graph and then refines the route with
+cost_a_star restricted to the clusters the abstract route passes through.
+
+Move costs come from costTensor.edge_cost_tensor, so the abstract graph depends
+on the environment date and mode and is cached on disk per (date, mode).
+"""
+import math
+import os
+import pickle
+from heapq import heappush, heappop
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, cost_a_star, dijkstra, path_length
+from costTensor import edge_cost_tensor, lower_bound_scale, cost_signature
+
+# Cluster side length in grid cells
+CLUSTER_SIZE = 10
+
+# Straight moves across a vertical / horizontal cluster border, and their reverse
+EAST, WEST = DIRECTIONS.index((1, 0)), DIRECTIONS.index((-1, 0))
+SOUTH, NORTH = DIRECTIONS.index((0, 1)), DIRECTIONS.index((0, -1))
+
+
+def cluster_of(x, y, cluster_size=CLUSTER_SIZE):
+    """Return the (column, row) of the cluster containing cell (x, y)."""
+    return x // cluster_size, y // cluster_size
+
+
+def cluster_bounds(cluster, shape, cluster_size=CLUSTER_SIZE):
+    """Return (x0, y0, x1, y1) of a cluster, clipped to a (rows, cols) grid."""
+    rows, cols = shape
+    cx, cy = cluster
+    return cx * cluster_size, cy * cluster_size, min((cx + 1) * cluster_size, cols), min((cy + 1) * cluster_size, rows)
+
+
+def _border_runs(open_pairs):
+    """Yield (first, last) index of every run of True values."""
+    run_start = None
+    for i, is_open in enumerate(open_pairs):
+        if is_open and run_start is None:
+            run_start = i
+        elif not is_open and run_start is not None:
+            yield run_start, i - 1
+            run_start = None
+    if run_start is not None:
+        yield run_start, len(open_pairs) - 1
+
+
+def _find_entrances(edge_costs, cluster_size):
+    """
+    Locate entrances on every cluster border.
+
+    Returns:
+        list: ((x, y), (nx, ny), cost there, cost back) for each entrance.
+    """
+    rows, cols, _ = edge_costs.shape
+    entrances = []
+    # Vertical borders: cell x on the left, x + 1 on the right
+    for x in range(cluster_size - 1, cols - 1, cluster_size):
+        for y0 in range(0, rows, cluster_size):
+            ys = np.arange(y0, min(y0 + cluster_size, rows))
+            open_pairs = np.isfinite(edge_costs[ys, x, EAST]) & np.isfinite(edge_costs[ys, x + 1, WEST])
+            for first, last in _border_runs(open_pairs.tolist()):
+                y = int(ys[(first + last) // 2])
+                entrances.append(((x, y), (x + 1, y), float(edge_costs[y, x, EAST]), float(edge_costs[y, x + 1, WEST])))
+    # Horizontal borders: cell y above, y + 1 below
+    for y in range(cluster_size - 1, rows - 1, cluster_size):
+        for x0 in range(0, cols, cluster_size):
+            xs = np.arange(x0, min(x0 + cluster_size, cols))
+            open_pairs = np.isfinite(edge_costs[y, xs, SOUTH]) & np.isfinite(edge_costs[y + 1, xs, NORTH])
+            for first, last in _border_runs(open_pairs.tolist()):
+                x = int(xs[(first + last) // 2])
+                entrances.append(((x, y), (x, y + 1), float(edge_costs[y, x, SOUTH]), float(edge_costs[y + 1, x, NORTH])))
+    return entrances
+
+
+def _cluster_costs(edge_costs, cluster, nodes, cluster_size, reverse=False, sources=None):
+    """
+    Cheapest in-cluster cost between sources and each node of a cluster.
+
+    Runs Dijkstra on the cluster's slice of the cost tensor, so moves that would
+    leave the cluster are simply off the grid.
+
+    Returns:
+        list: For each source, a list of (node, cost) for every reachable node.
+    """
+    x0, y0, x1, y1 = cluster_bounds(cluster, edge_costs.shape[:2], cluster_size)
+    window = edge_costs[y0:y1, x0:x1]
+    results = []
+    for sx, sy in (sources if sources is not None else nodes):
+        distance, _ = dijkstra(window, [(sx - x0, sy - y0)], reverse=reverse,
+                               targets=[(nx - x0, ny - y0) for nx, ny in nodes])
+        reached = []
+        for node in nodes:
+            cost = distance[node[1] - y0, node[0] - x0]
+            if node != (sx, sy) and math.isfinite(cost):
+                reached.append((node, float(cost)))
+        results.append(reached)
+    return results
+
+
+def build_abstract_graph(edge_costs, cluster_size=CLUSTER_SIZE):
+    """
+    Build the HPA* abstract graph for a cost tensor.
+
+    Args:
+        edge_costs (np.ndarray): (rows, cols, 8) move costs from edge_cost_tensor.
+        cluster_size (int): Cluster side length in cells.
+
+    Returns:
+        dict: 'cluster_size', 'clusters' mapping (cx, cy) to its entrance nodes,
+        and 'edges' mapping each node to a list of (neighbour node, cost).
+        Edges are directed since move costs depend on the destination cell.
+    """
+    edges = {}
+    clusters = {}
+    for a, b, cost_ab, cost_ba in _find_entrances(edge_costs, cluster_size):
+        for node in (a, b):
+            if node not in edges:
+                edges[node] = []
+                clusters.setdefault(cluster_of(*node, cluster_size), []).append(node)
+        edges[a].append((b, cost_ab))
+        edges[b].append((a, cost_ba))
+
+    for cluster, nodes in clusters.items():
+        for node, reached in zip(nodes, _cluster_costs(edge_costs, cluster, nodes, cluster_size)):
+            edges[node].extend(reached)
+
+    return {"cluster_size": cluster_size, "clusters": clusters, "edges": edges}
+
+
+def load_abstract_graph(edge_costs, cache_file, cluster_size=CLUSTER_SIZE):
+    """
+    Load the abstract graph from cache_file, rebuilding it if the costs changed.
+
+    Args:
+        edge_costs (np.ndarray): (rows, cols, 8) move costs from edge_cost_tensor.
+        cache_file (str): Path of the pickle cache.
+        cluster_size (int): Cluster side length in cells.
+
+    Returns:
+        dict: The abstract graph, see build_abstract_graph.
+    """
+    signature = cost_signature(edge_costs, cluster_size)
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached["signature"] == signature:
+                return cached["graph"]
+        except (OSError, KeyError, EOFError, pickle.UnpicklingError):
+            pass  # Unreadable cache, rebuild below
+
+    graph = build_abstract_graph(edge_costs, cluster_size)
+    with open(cache_file, 'wb') as f:
+        pickle.dump({"signature": signature, "graph": graph}, f)
+    print(f"HPA* graph with {len(graph['edges'])} nodes saved to {cache_file}")
+    return graph
+
+
+def _abstract_search(graph, edge_costs, start, end, scale):
+    """
+    A* over the abstract graph with start and end inserted.
+
+    Returns:
+        tuple: (list of abstract nodes from start to end or None, nodes expanded)
+    """
+    cluster_size = graph["cluster_size"]
+    start_cluster = cluster_of(*start, cluster_size)
+    end_cluster = cluster_of(*end, cluster_size)
+
+    # Connect start to its cluster's entrances, and those entrances to end
+    start_nodes = graph["clusters"].get(start_cluster, [])
+    end_nodes = graph["clusters"].get(end_cluster, [])
+    extra = {start: _cluster_costs(edge_costs, start_cluster, start_nodes + [end] * (start_cluster == end_cluster),
+                                   cluster_size, sources=[start])[0]}
+    to_end = _cluster_costs(edge_costs, end_cluster, end_nodes, cluster_size, reverse=True, sources=[end])[0]
+    for node, cost in to_end:
+        extra.setdefault(node, []).append((end, cost))
+
+    g_score = {start: 0.0}
+    parent = {start: None}
+    closed = set()
+    open_heap = [(0.0, start)]
+    while open_heap:
+        _, node = heappop(open_heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        if node == end:
+            route = []
+            while node is not None:
+                route.append(node)
+                node = parent[node]
+            return route[::-1], len(closed)
+        g = g_score[node]
+        for neighbor, cost in graph["edges"].get(node, []) + extra.get(node, []):
+            tentative = g + cost
+            if neighbor not in closed and tentative < g_score.get(neighbor, math.inf):
+                g_score[neighbor] = tentative
+                parent[neighbor] = node
+                f_score = tentative + scale * math.hypot(neighbor[0] - end[0], neighbor[1] - end[1])
+                heappush(open_heap, (f_score, neighbor))
+    return None, len(closed)
+
+
+def corridor_mask(route, shape, cluster_size=CLUSTER_SIZE):
+    """Boolean (rows, cols) mask of every cluster an abstract route touches."""
+    mask = np.zeros(shape, dtype=bool)
+    for node in route:
+        x0, y0, x1, y1 = cluster_bounds(cluster_of(*node, cluster_size), shape, cluster_size)
+        mask[y0:y1, x0:x1] = True
+    return mask
+
+
+def hierarchical_search(navigable, start, end, weights, heuristic, alignment, on_expand=None,
+                        edge_costs=None, graph=None, cluster_size=CLUSTER_SIZE, metrics=None):
+    """
+    Find a route with HPA*: abstract search, then refinement inside the corridor.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        edge_costs (np.ndarray): Precomputed edge_cost_tensor for these inputs.
+        graph (dict): Precomputed abstract graph, see load_abstract_graph.
+        cluster_size (int): Cluster side length when the graph is built here.
+        metrics (SearchMetrics): Optional collector of the phase times of the
+            cost_a_star loops.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict)
+    """
+    if edge_costs is None:
+        edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+    if graph is None:
+        graph = build_abstract_graph(edge_costs, cluster_size)
+    scale = lower_bound_scale(edge_costs)
+
+    route, abstract_expanded = _abstract_search(graph, edge_costs, start, end, scale)
+    allowed = corridor_mask(route, navigable.shape, graph["cluster_size"]) if route else None
+    path, explored, stats = cost_a_star(edge_costs, start, end, scale, allowed=allowed, on_expand=on_expand,
+                                        metrics=metrics)
+    fallback = allowed is not None and path is None
+    if fallback:
+        # Entrances only sample each border, so a narrow passage can be missed
+        path, more_explored, stats = cost_a_star(edge_costs, start, end, scale, on_expand=on_expand, metrics=metrics)
+        explored += more_explored
+        stats["expanded"] = len(explored)
+
+    stats.update({
+        "abstract_nodes": len(graph["edges"]),
+        "abstract_expanded": abstract_expanded,
+        "abstract_route": len(route) if route else 0,
+        "corridor_cells": int(allowed.sum()) if allowed is not None else 0,
+        "fallback": fallback or allowed is None,
+        "distance": path_length(start, path) if path else math.inf,
+    })
+    return path, explored, stats
@@ -0,0 +1,240 @@
+"""
+Incremental replanning with D* Lite.
+
+D* Lite searches backwards from the end towards the vessel and keeps its
+g / rhs values between calls. When environment layers are updated only the
+moves whose cost actually changed are fed back in, and the search repairs the
+part of the cost field that depends on them instead of starting over. The
+vessel may also advance along the route between updates.
+
+Move costs come from costTensor.edge_cost_tensor, as for the other cost-based
+searches.
+"""
+import math
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, path_length
+from costTensor import edge_cost_tensor, lower_bound_scale
+
+
+class DStarLite:
+    """
+    Search state of one route, kept so the route can be repaired later.
+
+    Attributes:
+        start (tuple): Current vessel cell (grid_x, grid_y).
+        end (tuple): Destination cell.
+        stats (dict): Counters of the last plan() call and running totals.
+    """
+
+    def __init__(self, edge_costs, start, end):
+        """
+        Args:
+            edge_costs (np.ndarray): (rows, cols, 8) move costs from edge_cost_tensor.
+            start (tuple): Start cell (grid_x, grid_y).
+            end (tuple): End cell (grid_x, grid_y).
+        """
+        self.rows, self.cols, self.directions = edge_costs.shape
+        self.start = tuple(start)
+        self.end = tuple(end)
+        self.stats = {"plans": 0, "total_expanded": 0}
+        self._reset(edge_costs)
+
+    def _reset(self, edge_costs):
+        """Drop all search state and start from scratch on edge_costs."""
+        size = self.rows * self.cols
+        self.edge_costs = np.array(edge_costs, dtype=np.float32)
+        self._costs = memoryview(self.edge_costs.reshape(-1))
+        self.scale = lower_bound_scale(self.edge_costs)
+        self.g = array('d', [math.inf]) * size
+        self.rhs = array('d', [math.inf]) * size
+        self._queued = {}  # cell id -> key it is queued with
+        self._heap = []
+        self.km = 0.0
+        self._last_start = self.start
+        end_id = self._id(self.end)
+        self.rhs[end_id] = 0.0
+        self._push(end_id)
+
+    def _id(self, cell):
+        return cell[1] * self.cols + cell[0]
+
+    def _h(self, cell_id):
+        """Admissible estimate of the cost from the vessel to cell_id."""
+        y, x = divmod(cell_id, self.cols)
+        return self.scale * math.hypot(x - self.start[0], y - self.start[1])
+
+    def _key(self, cell_id):
+        m = min(self.g[cell_id], self.rhs[cell_id])
+        return (m + self._h(cell_id) + self.km, m)
+
+    def _push(self, cell_id):
+        key = self._key(cell_id)
+        self._queued[cell_id] = key
+        heappush(self._heap, (key, cell_id))
+
+    def _top(self):
+        """Return (key, cell id) of the best live queue entry, dropping stale ones."""
+        while self._heap:
+            key, cell_id = self._heap[0]
+            if self._queued.get(cell_id) == key:
+                return key, cell_id
+            heappop(self._heap)
+        return (math.inf, math.inf), -1
+
+    def _neighbors(self, cell_id, reverse):
+        """
+        Yield (neighbour id, move cost) for every finite move out of cell_id,
+        or into it when reverse is True.
+        """
+        y, x = divmod(cell_id, self.cols)
+        for k, (dx, dy) in enumerate(DIRECTIONS):
+            nx, ny = (x - dx, y - dy) if reverse else (x + dx, y + dy)
+            if not (0 <= nx < self.cols and 0 <= ny < self.rows):
+                continue
+            neighbor_id = ny * self.cols + nx
+            cost = self._costs[(neighbor_id if reverse else cell_id) * self.directions + k]
+            if cost != math.inf:
+                yield neighbor_id, cost
+
+    def _best_rhs(self, cell_id):
+        return min((cost + self.g[n] for n, cost in self._neighbors(cell_id, reverse=False)), default=math.inf)
+
+    def _update_vertex(self, cell_id):
+        if self.g[cell_id] != self.rhs[cell_id]:
+            self._push(cell_id)
+        else:
+            self._queued.pop(cell_id, None)
+
+    def _compute(self, on_expand=None):
+        """Process the queue until the route from the vessel is settled."""
+        start_id = self._id(self.start)
+        end_id = self._id(self.end)
+        explored = []
+        while True:
+            key, cell_id = self._top()
+            if cell_id < 0 or (key >= self._key(start_id) and self.rhs[start_id] <= self.g[start_id]):
+                break
+            new_key = self._key(cell_id)
+            if key < new_key:
+                self._push(cell_id)
+                continue
+            heappop(self._heap)
+            del self._queued[cell_id]
+
+            y, x = divmod(cell_id, self.cols)
+            explored.append((x, y))
+            if on_expand is not None:
+                on_expand((x, y))
+
+            if self.g[cell_id] > self.rhs[cell_id]:
+                self.g[cell_id] = self.rhs[cell_id]
+                for pred_id, cost in self._neighbors(cell_id, reverse=True):
+                    if pred_id != end_id and cost + self.g[cell_id] < self.rhs[pred_id]:
+                        self.rhs[pred_id] = cost + self.g[cell_id]
+                        self._update_vertex(pred_id)
+            else:
+                g_old = self.g[cell_id]
+                self.g[cell_id] = math.inf
+                for pred_id, cost in list(self._neighbors(cell_id, reverse=True)) + [(cell_id, None)]:
+                    if pred_id != end_id and (cost is None or self.rhs[pred_id] == cost + g_old):
+                        self.rhs[pred_id] = self._best_rhs(pred_id)
+                    self._update_vertex(pred_id)
+        return explored
+
+    def plan(self, on_expand=None):
+        """
+        Bring the search up to date and extract the route.
+
+        Args:
+            on_expand (callable): Optional callback invoked with every expanded cell.
+
+        Returns:
+            tuple: (path or None, explored cells, stats dict)
+        """
+        explored = self._compute(on_expand)
+        self.stats["plans"] += 1
+        self.stats["total_expanded"] += len(explored)
+        self.stats["expanded"] = len(explored)
+        self.stats["cost"] = self.rhs[self._id(self.start)]
+
+        path = self.path()
+        self.stats["distance"] = path_length(self.start, path) if path is not None else math.inf
+        return path, explored, dict(self.stats)
+
+    def path(self):
+        """Follow the cheapest successors from the vessel to the end; None if unreachable."""
+        cell_id = self._id(self.start)
+        end_id = self._id(self.end)
+        if self.rhs[cell_id] == math.inf:
+            return None
+        path = []
+        # Every step lowers g, so the walk cannot exceed the number of cells
+        for _ in range(self.rows * self.cols):
+            if cell_id == end_id:
+                return path
+            cell_id = min(self._neighbors(cell_id, reverse=False), key=lambda move: move[1] + self.g[move[0]])[0]
+            y, x = divmod(cell_id, self.cols)
+            path.append((x, y))
+        return None
+
+    def move_to(self, cell):
+        """Advance the vessel to a new cell before the next plan()."""
+        self.start = tuple(cell)
+        self.km += self.scale * math.hypot(self.start[0] - self._last_start[0], self.start[1] - self._last_start[1])
+        self._last_start = self.start
+
+    def update_costs(self, edge_costs):
+        """
+        Apply new move costs before the next plan().
+
+        Only moves whose cost changed are touched. If some move became cheaper
+        than the heuristic assumed, the estimate would no longer be admissible
+        and the state is rebuilt from scratch instead.
+
+        Returns:
+            int: Number of moves whose cost changed.
+        """
+        edge_costs = np.asarray(edge_costs, dtype=np.float32)
+        changed = np.argwhere(edge_costs != self.edge_costs)
+        self.stats["changed_moves"] = len(changed)
+        if len(changed) == 0:
+            return 0
+        if lower_bound_scale(edge_costs) < self.scale:
+            self.stats["rebuilds"] = self.stats.get("rebuilds", 0) + 1
+            self._reset(edge_costs)
+            return len(changed)
+
+        end_id = self._id(self.end)
+        for y, x, k in changed.tolist():
+            cell_id = y * self.cols + x
+            old_cost = self._costs[cell_id * self.directions + k]
+            new_cost = float(edge_costs[y, x, k])
+            self._costs[cell_id * self.directions + k] = new_cost
+            if cell_id == end_id:
+                continue
+            dx, dy = DIRECTIONS[k]
+            target_id = cell_id + dy * self.cols + dx
+            if new_cost < old_cost:
+                self.rhs[cell_id] = min(self.rhs[cell_id], new_cost + self.g[target_id])
+            elif self.rhs[cell_id] == old_cost + self.g[target_id]:
+                self.rhs[cell_id] = self._best_rhs(cell_id)
+            self._update_vertex(cell_id)
+        return len(changed)
+
+
+def d_star_lite_search(navigable, start, end, weights, heuristic, alignment, on_expand=None, edge_costs=None):
+    """
+    One-shot D* Lite search with the same interface as a_star_search.
+
+    Use RouteEngine.start_replanning to keep the state for later repairs.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict)
+    """
+    if edge_costs is None:
+        edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+    return DStarLite(edge_costs, start, end).plan(on_expand)
@@ -1,5 +1,4 @@
 import pygame
-import cv2
 import time
 
 def play_intro_animation(screen, intro_video_path, screen_width, screen_height):
@@ -13,6 +12,8 @@ def play_intro_animation(screen, intro_video_path, screen_width, screen_height):
         screen_height (int): Height of the display.
     """
     try:
+        import cv2  # Imported here so startup doesn't pay for OpenCV until the intro plays
+
         # Initialize Pygame
         pygame.init()
 
@@ -0,0 +1,305 @@
+"""
+Jump Point Search over uniform-cost open water.
+
+Where wind, current and heuristic do not change, each of the 8 moves costs the
+same wherever it is made, so every reordering of the moves between two cells
+costs the same. JPS expands only one canonical path per group of such
+symmetric paths: it jumps in a straight line or diagonal until something
+interesting happens and pushes only that jump point onto the queue.
+
+A cell is open water when every navigable cell around it agrees on the cost of
+each move it can make, and those costs are convex (a diagonal never costs more
+than its two straight components, a straight move never more than the mean of
+its two neighbouring diagonals), see open_water_mask. Inside open water, land
+and the grid edge are the only obstacles and the usual JPS pruning and forced
+neighbour rules are exact. A jump stops at the end, at a cell with a forced
+neighbour, or on entering a cell that is not open water, where the costs
+really change; such cells are expanded to all 8 neighbours like cost_a_star
+does, so route costs stay optimal under costTensor.edge_cost_tensor. Where a
+straight run ends is precomputed for every cell (see jump_tables), so straight
+jumps are O(1).
+"""
+import math
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, path_length
+from costTensor import destination_values, edge_cost_tensor, lower_bound_scale
+
+MOVE_INDEX = {move: k for k, move in enumerate(DIRECTIONS)}
+STRAIGHT_MOVES = [k for k, (dx, dy) in enumerate(DIRECTIONS) if not (dx and dy)]
+
+
+def open_water_mask(edge_costs, navigable):
+    """
+    Cells around which JPS pruning is exact.
+
+    A navigable cell qualifies when, for each of the 8 moves, every navigable
+    cell of its 3x3 neighbourhood that can make the move makes it at the same
+    cost, at least one of them can, and those 8 costs are convex.
+
+    Args:
+        edge_costs (np.ndarray): (rows, cols, 8) move costs from edge_cost_tensor.
+        navigable (np.ndarray): Boolean (rows, cols) raster.
+
+    Returns:
+        np.ndarray: Boolean (rows, cols) array.
+    """
+    navigable = np.asarray(navigable, dtype=bool)
+    low = np.full(edge_costs.shape, np.inf, dtype=np.float32)
+    high = np.full(edge_costs.shape, -np.inf, dtype=np.float32)
+    for k in [None] + list(range(len(DIRECTIONS))):
+        inside = navigable if k is None else destination_values(navigable, k, False)
+        for channel in range(len(DIRECTIONS)):
+            costs = edge_costs[:, :, channel]
+            if k is not None:
+                costs = destination_values(costs, k, np.float32(np.inf))
+            finite = inside & np.isfinite(costs)
+            low[:, :, channel] = np.where(finite, np.minimum(low[:, :, channel], costs), low[:, :, channel])
+            high[:, :, channel] = np.where(finite, np.maximum(high[:, :, channel], costs), high[:, :, channel])
+
+    open_water = navigable & np.isfinite(low).all(axis=2) & (low == high).all(axis=2)
+    for k, (dx, dy) in enumerate(DIRECTIONS):
+        if dx and dy:
+            open_water &= low[:, :, k] <= low[:, :, MOVE_INDEX[(dx, 0)]] + low[:, :, MOVE_INDEX[(0, dy)]]
+        else:
+            sides = [(dx or s, dy or s) for s in (1, -1)]
+            open_water &= 2 * low[:, :, k] <= low[:, :, MOVE_INDEX[sides[0]]] + low[:, :, MOVE_INDEX[sides[1]]]
+    return open_water
+
+
+def jump_tables(edge_costs, navigable):
+    """
+    Open water and where every straight run from every cell ends.
+
+    A straight run stops on entering a cell that is not open water or that has
+    a forced neighbour (land or the grid edge beside it ends), and dies where
+    the next move is blocked.
+
+    Args:
+        edge_costs (np.ndarray): (rows, cols, 8) move costs from edge_cost_tensor.
+        navigable (np.ndarray): Boolean (rows, cols) raster.
+
+    Returns:
+        dict: 'open_water', the open_water_mask, and 'jumps', an int32 array of
+        shape (8, rows, cols) filled in for the straight moves: entry [k, y, x]
+        is n > 0 if move k from (x, y) reaches a jump point after n steps, and
+        -n if it runs n steps into a blocked move without finding one.
+    """
+    navigable = np.asarray(navigable, dtype=bool)
+    open_water = open_water_mask(edge_costs, navigable)
+    rows, cols = navigable.shape
+    blocked = [~destination_values(navigable, k, False) for k in range(len(DIRECTIONS))]
+    jumps = np.zeros((len(DIRECTIONS), rows, cols), dtype=np.int32)
+    for k in STRAIGHT_MOVES:
+        dx, dy = DIRECTIONS[k]
+        stop = ~open_water
+        for s in (1, -1):
+            side = (0, s) if dx else (s, 0)
+            ahead = (dx, s) if dx else (s, dy)
+            stop |= blocked[MOVE_INDEX[side]] & ~blocked[MOVE_INDEX[ahead]]
+        movable = np.isfinite(edge_costs[:, :, k])
+        # Sweep against the move so the next cell's run is always known
+        if dx:
+            order = range(cols - 1, -1, -1) if dx > 0 else range(cols)
+            for x in order:
+                if 0 <= x + dx < cols:
+                    onward = jumps[k, :, x + dx]
+                    run = np.where(stop[:, x + dx], 1, np.where(onward > 0, onward + 1, onward - 1))
+                    jumps[k, :, x] = np.where(movable[:, x], run, 0)
+        else:
+            order = range(rows - 1, -1, -1) if dy > 0 else range(rows)
+            for y in order:
+                if 0 <= y + dy < rows:
+                    onward = jumps[k, y + dy, :]
+                    run = np.where(stop[y + dy, :], 1, np.where(onward > 0, onward + 1, onward - 1))
+                    jumps[k, y, :] = np.where(movable[y, :], run, 0)
+    return {"open_water": open_water, "jumps": jumps}
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def jump_point_search(navigable, start, end, weights, heuristic, alignment, on_expand=None,
+                      edge_costs=None, tables=None):
+    """
+    Find the cheapest route with Jump Point Search.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded jump point.
+        edge_costs (np.ndarray): Precomputed edge_cost_tensor for these inputs.
+        tables (dict): Precomputed jump_tables of edge_costs.
+
+    Returns:
+        tuple: (path or None, explored jump points, stats dict)
+    """
+    if edge_costs is None:
+        edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+    if tables is None:
+        tables = jump_tables(edge_costs, navigable)
+    rows, cols, directions = edge_costs.shape
+    size = rows * cols
+    end_x, end_y = end
+    scale = lower_bound_scale(edge_costs)
+    costs = memoryview(np.ascontiguousarray(edge_costs, dtype=np.float32).reshape(-1))
+    passable = np.asarray(navigable, dtype=bool).tobytes()
+    open_water = tables["open_water"].tobytes()
+    runs = memoryview(np.ascontiguousarray(tables["jumps"], dtype=np.int32).reshape(-1))
+
+    start_id = start[1] * cols + start[0]
+    end_id = end_y * cols + end_x
+    g_score = array('d', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    g_score[start_id] = 0.0
+    open_heap = [(0.0, start_id)]
+    scanned = 0
+
+    def blocked(x, y):
+        return not (0 <= x < cols and 0 <= y < rows and passable[y * cols + x])
+
+    def forced_moves(x, y, dx, dy):
+        """Moves out of (x, y) that land or the grid edge force after arriving with (dx, dy)."""
+        if dx and dy:
+            moves = [(-dx, dy)] if blocked(x - dx, y) and not blocked(x - dx, y + dy) else []
+            if blocked(x, y - dy) and not blocked(x + dx, y - dy):
+                moves.append((dx, -dy))
+            return moves
+        if dx:
+            return [(dx, s) for s in (1, -1) if blocked(x, y + s) and not blocked(x + dx, y + s)]
+        return [(s, dy) for s in (1, -1) if blocked(x + s, y) and not blocked(x + s, y + dy)]
+
+    def end_ahead(cell_id, dx, dy, steps):
+        """Steps along (dx, dy) from cell_id to the end if it is within steps, else 0."""
+        y, x = divmod(cell_id, cols)
+        if dx and y == end_y and 0 < (end_x - x) * dx <= steps:
+            return abs(end_x - x)
+        if dy and x == end_x and 0 < (end_y - y) * dy <= steps:
+            return abs(end_y - y)
+        return 0
+
+    def jump_straight(cell_id, dx, dy):
+        """Straight jump from cell_id; (jump point id, cost) or None."""
+        nonlocal scanned
+        scanned += 1
+        k = MOVE_INDEX[(dx, dy)]
+        steps = runs[k * size + cell_id]
+        to_end = end_ahead(cell_id, dx, dy, abs(steps))
+        if to_end:
+            steps = to_end
+        elif steps <= 0:
+            return None
+        # Every move along a run costs the same as the first
+        return cell_id + steps * (dy * cols + dx), steps * costs[cell_id * directions + k]
+
+    def jump_diagonal(cell_id, dx, dy):
+        """Diagonal jump from cell_id; (jump point id, cost) or None."""
+        nonlocal scanned
+        k = MOVE_INDEX[(dx, dy)]
+        offset = dy * cols + dx
+        cost = 0.0
+        while True:
+            move_cost = costs[cell_id * directions + k]
+            if move_cost == math.inf:
+                return None
+            cost += move_cost
+            cell_id += offset
+            scanned += 1
+            if cell_id == end_id or not open_water[cell_id]:
+                return cell_id, cost
+            y, x = divmod(cell_id, cols)
+            if forced_moves(x, y, dx, dy):
+                return cell_id, cost
+            # A diagonal stops where one of its straight components finds a jump point or the end
+            for sx, sy in ((dx, 0), (0, dy)):
+                steps = runs[MOVE_INDEX[(sx, sy)] * size + cell_id]
+                if steps > 0 or end_ahead(cell_id, sx, sy, -steps):
+                    return cell_id, cost
+
+    explored = []
+    pushes = 1
+    stale_pops = 0
+    peak_open = 1
+    found = False
+
+    while open_heap:
+        _, cell_id = heappop(open_heap)
+        if closed[cell_id]:
+            stale_pops += 1
+            continue
+        closed[cell_id] = 1
+
+        y, x = divmod(cell_id, cols)
+        if cell_id != start_id and cell_id != end_id:
+            explored.append((x, y))
+            if on_expand is not None:
+                on_expand((x, y))
+
+        if cell_id == end_id:
+            found = True
+            break
+
+        parent_id = parent[cell_id]
+        if open_water[cell_id] and parent_id >= 0:
+            # Natural neighbours (onwards, plus both components after a diagonal) and forced ones
+            py, px = divmod(parent_id, cols)
+            dx, dy = _sign(x - px), _sign(y - py)
+            moves = [(dx, dy), (dx, 0), (0, dy)] if dx and dy else [(dx, dy)]
+            moves += forced_moves(x, y, dx, dy)
+        else:
+            moves = DIRECTIONS
+
+        g = g_score[cell_id]
+        for dx, dy in moves:
+            result = jump_diagonal(cell_id, dx, dy) if dx and dy else jump_straight(cell_id, dx, dy)
+            if result is None:
+                continue
+            neighbor_id, cost = result
+            if closed[neighbor_id]:
+                continue
+            tentative_g = g + cost
+            if tentative_g < g_score[neighbor_id]:
+                g_score[neighbor_id] = tentative_g
+                parent[neighbor_id] = cell_id
+                ny, nx = divmod(neighbor_id, cols)
+                heappush(open_heap, (tentative_g + scale * math.hypot(nx - end_x, ny - end_y), neighbor_id))
+                pushes += 1
+        if len(open_heap) > peak_open:
+            peak_open = len(open_heap)
+
+    stats = {
+        "expanded": len(explored),
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "scanned": scanned,
+        "cost": g_score[end_id],
+        "distance": math.inf,
+    }
+    if not found:
+        return None, explored, stats
+
+    # Fill in the straight and diagonal runs between jump points
+    path = []
+    cell_id = end_id
+    while cell_id != start_id:
+        parent_id = parent[cell_id]
+        y, x = divmod(cell_id, cols)
+        py, px = divmod(parent_id, cols)
+        dx, dy = _sign(x - px), _sign(y - py)
+        while (x, y) != (px, py):
+            path.append((x, y))
+            x, y = x - dx, y - dy
+        cell_id = parent_id
+    path.reverse()
+    stats["distance"] = path_length(start, path)
+    return path, explored, stats
@@ -0,0 +1,153 @@
+"""
+ALT (A*, Landmarks, Triangle inequality) lower bounds.
+
+For a handful of landmark cells, ports by default, Dijkstra is run once to and
+from every cell. For a cell v, a landmark L and the end t, the triangle
+inequality gives two lower bounds on the cost from v to t:
+
+    d(v, t) >= d(v, L) - d(t, L)
+    d(v, t) >= d(L, t) - d(L, v)
+
+The best of these over all landmarks follows the coast around the peninsula
+and Sri Lanka, where the straight-line estimate badly underestimates. Distance
+arrays depend on the move costs and are cached on disk per (date, mode); the
+bounds towards an end cell are kept in memory for the most recent ends, as
+routes mostly end at the same few ports.
+"""
+import math
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from gridSearch import cost_a_star, dijkstra, path_length
+from costTensor import edge_cost_tensor, lower_bound_scale, cost_signature
+
+# End cells whose bounds are kept per set of landmarks
+BOUNDS_CACHE_SIZE = 32
+
+
+def build_landmarks(edge_costs, cells):
+    """
+    Run Dijkstra from and to every landmark.
+
+    Args:
+        edge_costs (np.ndarray): (rows, cols, 8) move costs from edge_cost_tensor.
+        cells (list): Landmark cells (grid_x, grid_y).
+
+    Returns:
+        dict: 'cells' (L, 2) int array, 'from' and 'to' (L, rows, cols) float32
+        arrays of the cost from each landmark / to each landmark, inf if unreachable.
+    """
+    from_landmark = np.stack([dijkstra(edge_costs, [cell])[0] for cell in cells]).astype(np.float32)
+    to_landmark = np.stack([dijkstra(edge_costs, [cell], reverse=True)[0] for cell in cells]).astype(np.float32)
+    return {"cells": np.array(cells, dtype=np.int32), "from": from_landmark, "to": to_landmark}
+
+
+def load_landmarks(edge_costs, cells, cache_file):
+    """
+    Load landmark distances from cache_file, rebuilding them if the costs or landmarks changed.
+
+    Returns:
+        dict: Landmark distances, see build_landmarks.
+    """
+    cells = [tuple(cell) for cell in cells]
+    signature = cost_signature(edge_costs, cells)
+    if os.path.exists(cache_file):
+        try:
+            with np.load(cache_file) as cached:
+                if str(cached["signature"]) == signature:
+                    return {"cells": cached["cells"], "from": cached["from"], "to": cached["to"]}
+        except (OSError, KeyError, ValueError):
+            pass  # Unreadable cache, rebuild below
+
+    landmarks = build_landmarks(edge_costs, cells)
+    np.savez_compressed(cache_file, signature=np.array(signature), **landmarks)
+    print(f"Distances for {len(cells)} landmarks saved to {cache_file}")
+    return landmarks
+
+
+def landmark_bounds(landmarks, end):
+    """
+    Lower bound on the cost from every cell to end.
+
+    Returns:
+        np.ndarray: Float64 (rows, cols) array; inf where end is unreachable.
+    """
+    end_x, end_y = end
+    bounds = np.zeros(landmarks["from"].shape[1:], dtype=np.float64)
+    for from_landmark, to_landmark in zip(landmarks["from"], landmarks["to"]):
+        # d(v, L) - d(t, L); says nothing when the end cannot reach L
+        to_end = to_landmark[end_y, end_x]
+        if np.isfinite(to_end):
+            np.maximum(bounds, np.subtract(to_landmark, to_end, dtype=np.float64), out=bounds)
+        # d(L, t) - d(L, v); when L cannot reach the end, no cell L reaches can either
+        from_end = from_landmark[end_y, end_x]
+        if np.isfinite(from_end):
+            np.maximum(bounds, np.subtract(from_end, from_landmark, dtype=np.float64), out=bounds)
+        else:
+            bounds[np.isfinite(from_landmark)] = np.inf
+    return bounds
+
+
+def end_bounds(landmarks, edge_costs, end):
+    """
+    Lower bounds towards end for landmark_search, cached in landmarks per end cell.
+
+    Never weaker than the straight-line bound the plain search uses.
+
+    Returns:
+        np.ndarray: Float64 (rows, cols) array.
+    """
+    cache = landmarks.setdefault("bounds", OrderedDict())
+    end = tuple(end)
+    if end in cache:
+        cache.move_to_end(end)
+        return cache[end]
+
+    if "scale" not in landmarks:
+        landmarks["scale"] = lower_bound_scale(edge_costs)
+    rows, cols = edge_costs.shape[:2]
+    bounds = landmarks["scale"] * np.hypot(np.arange(cols) - end[0], (np.arange(rows) - end[1])[:, np.newaxis])
+    if len(landmarks["cells"]):
+        np.maximum(bounds, landmark_bounds(landmarks, end), out=bounds)
+
+    cache[end] = bounds
+    if len(cache) > BOUNDS_CACHE_SIZE:
+        cache.popitem(last=False)
+    return bounds
+
+
+def landmark_search(navigable, start, end, weights, heuristic, alignment, on_expand=None,
+                    edge_costs=None, landmarks=None, landmark_cells=(), metrics=None):
+    """
+    A* over edge costs guided by landmark lower bounds.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        edge_costs (np.ndarray): Precomputed edge_cost_tensor for these inputs.
+        landmarks (dict): Precomputed landmark distances, see load_landmarks.
+        landmark_cells (list): Landmarks to build distances for when landmarks is None.
+        metrics (SearchMetrics): Optional collector of the phase times of the cost_a_star loop.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict)
+    """
+    if edge_costs is None:
+        edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+    if landmarks is None:
+        landmarks = build_landmarks(edge_costs, list(landmark_cells))
+
+    bounds = end_bounds(landmarks, edge_costs, end)
+    path, explored, stats = cost_a_star(edge_costs, start, end, lower_bounds=bounds, on_expand=on_expand,
+                                        metrics=metrics)
+    stats["landmarks"] = len(landmarks["cells"])
+    stats["start_bound"] = float(bounds[start[1], start[0]])
+    stats["distance"] = path_length(start, path) if path is not None else math.inf
+    return path, explored, stats
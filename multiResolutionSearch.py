@@ -0,0 +1,173 @@
+"""
+Coarse-to-fine multi-resolution corridor search.
+
+A pyramid of cost tensors is built by halving the grid resolution repeatedly:
+a coarse cell is navigable if any of its four finer cells is, and its move in
+each direction costs twice the mean of the finer cells' finite moves in that
+direction. The route is solved on the coarsest level, and each finer level is
+searched only inside the coarse route's cells widened by a buffer, down to full
+resolution. Memory and expansions at the fine level are thus bounded by the
+corridor instead of the whole grid.
+
+Coarse levels are optimistic about narrow passages, so when a corridor holds no
+route the buffer is widened once and then the full grid is searched, as
+hierarchicalSearch does.
+"""
+import math
+import warnings
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, cost_a_star, path_length
+from costTensor import destination_values, edge_cost_tensor, lower_bound_scale
+
+# Coarse levels above full resolution, each halving the grid
+DEFAULT_LEVELS = 2
+# Cells the corridor is widened by on each side, at the level being refined
+DEFAULT_BUFFER = 3
+
+
+def coarsen(edge_costs, navigable):
+    """
+    Halve the resolution of a cost tensor and its navigability raster.
+
+    Returns:
+        tuple: (coarse (ceil(rows/2), ceil(cols/2), 8) float32 costs, coarse boolean raster)
+    """
+    rows, cols, directions = edge_costs.shape
+    coarse_rows, coarse_cols = (rows + 1) // 2, (cols + 1) // 2
+    padded = np.full((coarse_rows * 2, coarse_cols * 2, directions), np.inf, dtype=np.float32)
+    padded[:rows, :cols] = edge_costs
+    open_cells = np.zeros((coarse_rows * 2, coarse_cols * 2), dtype=bool)
+    open_cells[:rows, :cols] = navigable
+
+    blocks = np.where(np.isfinite(padded), padded, np.nan).reshape(coarse_rows, 2, coarse_cols, 2, directions)
+    coarse_navigable = open_cells.reshape(coarse_rows, 2, coarse_cols, 2).any(axis=(1, 3))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # Mean of a block without finite moves
+        coarse = 2 * np.nanmean(blocks, axis=(1, 3))
+    coarse = np.where(np.isnan(coarse), np.inf, coarse).astype(np.float32)
+    for k in range(directions):
+        enterable = destination_values(coarse_navigable, k, False)
+        coarse[:, :, k][~(enterable & coarse_navigable)] = np.inf
+    return coarse, coarse_navigable
+
+
+def build_pyramid(edge_costs, navigable, levels=DEFAULT_LEVELS):
+    """
+    Cost tensors from full resolution down to the coarsest level.
+
+    Returns:
+        list: (edge_costs, navigable) per level; index 0 is full resolution and
+        level i has cells 2 ** i fine cells wide.
+    """
+    pyramid = [(edge_costs, np.asarray(navigable, dtype=bool))]
+    for _ in range(levels):
+        pyramid.append(coarsen(*pyramid[-1]))
+    return pyramid
+
+
+def dilate(mask, cells):
+    """Grow a boolean mask by a number of cells in all 8 directions."""
+    grown = mask.copy()
+    for _ in range(cells):
+        step = grown.copy()
+        for k in range(len(DIRECTIONS)):
+            step |= destination_values(grown, k, False)
+        grown = step
+    return grown
+
+
+def corridor(route, start, shape, buffer):
+    """
+    Cells of the next finer level under a coarse route, widened by buffer.
+
+    Args:
+        route (list): Coarse cells (x, y) of the route, start excluded.
+        start (tuple): Coarse start cell.
+        shape (tuple): (rows, cols) of the finer level.
+        buffer (int): Finer-level cells to widen by.
+    """
+    rows, cols = shape
+    coarse = np.zeros(((rows + 1) // 2, (cols + 1) // 2), dtype=bool)
+    for x, y in [start] + list(route):
+        coarse[y, x] = True
+    fine = np.repeat(np.repeat(coarse, 2, axis=0), 2, axis=1)[:rows, :cols]
+    return dilate(fine, buffer)
+
+
+def multi_resolution_search(navigable, start, end, weights, heuristic, alignment, on_expand=None,
+                            edge_costs=None, pyramid=None, levels=DEFAULT_LEVELS, buffer=DEFAULT_BUFFER,
+                            metrics=None):
+    """
+    Find a route coarse to fine through a pyramid of cost tensors.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every cell expanded at full resolution.
+        edge_costs (np.ndarray): Precomputed edge_cost_tensor for these inputs.
+        pyramid (list): Precomputed build_pyramid output.
+        levels (int): Coarse levels when the pyramid is built here.
+        buffer (int): Corridor half-width in cells of the level being refined.
+        metrics (SearchMetrics): Optional collector of the phase times of the
+            cost_a_star loops, coarse levels included.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict)
+    """
+    if pyramid is None:
+        if edge_costs is None:
+            edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+        pyramid = build_pyramid(edge_costs, navigable, levels)
+    edge_costs = pyramid[0][0]
+
+    route = None
+    allowed = None
+    level_expanded = []
+    corridor_cells = []
+    for level in range(len(pyramid) - 1, 0, -1):
+        costs = pyramid[level][0]
+        factor = 2 ** level
+        level_start = (start[0] // factor, start[1] // factor)
+        level_end = (end[0] // factor, end[1] // factor)
+        if route is not None:
+            allowed = corridor(route, (start[0] // (factor * 2), start[1] // (factor * 2)), costs.shape[:2], buffer)
+            corridor_cells.append(int(allowed.sum()))
+        route, _, level_stats = cost_a_star(costs, level_start, level_end, lower_bound_scale(costs), allowed=allowed,
+                                           metrics=metrics)
+        level_expanded.append(level_stats["expanded"])
+        if route is None:
+            break  # Coarse levels found nothing, search the full grid
+
+    scale = lower_bound_scale(edge_costs)
+    fallback = route is None
+    explored = []
+    path = None
+    if route is not None:
+        for widen in (1, 3):
+            allowed = corridor(route, (start[0] // 2, start[1] // 2), edge_costs.shape[:2], buffer * widen)
+            path, more_explored, stats = cost_a_star(edge_costs, start, end, scale, allowed=allowed, on_expand=on_expand,
+                                                     metrics=metrics)
+            explored += more_explored
+            corridor_cells.append(int(allowed.sum()))
+            if path is not None:
+                break
+        fallback = path is None
+    if fallback:
+        path, more_explored, stats = cost_a_star(edge_costs, start, end, scale, on_expand=on_expand, metrics=metrics)
+        explored += more_explored
+    stats["expanded"] = len(explored)
+
+    stats.update({
+        "levels": len(pyramid) - 1,
+        "level_expanded": level_expanded,
+        "corridor_cells": corridor_cells,
+        "fallback": fallback,
+        "distance": path_length(start, path) if path is not None else math.inf,
+    })
+    return path, explored, stats
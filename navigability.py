@@ -0,0 +1,125 @@
+"""
+Navigability raster for the routing grid.
+
+Combines the land mask from the map images, the hand-curated blocked cells in
+storage.py and the depth rule into one boolean (GRID_ROWS, GRID_COLS) array, so
+neighbour generation is a single array index. The raster is cached on disk and
+rebuilt automatically whenever one of its inputs changes.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pygame
+
+import storage
+from depthCells import load_depth_grid, DEPTH_RASTER_FILE
+from CoordConv import GRID_SIZE, MAP_WIDTH, MAP_HEIGHT, GRID_COLS, GRID_ROWS
+
+# Map images, composited the same way the UI draws them
+BACKGROUND_IMAGE = "India.jpeg"
+FOREGROUND_IMAGE = "IndiaFore3.png"
+CACHE_FILE = "navigability_mask.npz"
+
+# Cells must be deeper than this (metres, negative down) to be navigable
+MAX_NAVIGABLE_DEPTH = -48
+
+
+def load_land_mask(background_path=BACKGROUND_IMAGE, foreground_path=FOREGROUND_IMAGE):
+    """
+    Build the land mask by compositing the map images off-screen.
+
+    A cell is land when the pixel at its centre is black, which is what the UI's
+    is_black_pixel reads back from the screen. No display needs to be open.
+
+    Returns:
+        np.ndarray: Boolean array of shape (GRID_ROWS, GRID_COLS), True on land.
+    """
+    surface = pygame.Surface((MAP_WIDTH, MAP_HEIGHT))
+    surface.blit(pygame.transform.scale(pygame.image.load(background_path), (MAP_WIDTH, MAP_HEIGHT)), (0, 0))
+    surface.blit(pygame.transform.scale(pygame.image.load(foreground_path), (MAP_WIDTH, MAP_HEIGHT)), (0, 0))
+    pixels = pygame.surfarray.array3d(surface)  # indexed [x, y]
+
+    land = np.zeros((GRID_ROWS, GRID_COLS), dtype=bool)
+    centres_x = np.arange(GRID_COLS) * GRID_SIZE + GRID_SIZE // 2
+    centres_y = np.arange(GRID_ROWS) * GRID_SIZE + GRID_SIZE // 2
+    inside_x = centres_x < MAP_WIDTH
+    inside_y = centres_y < MAP_HEIGHT
+    samples = pixels[centres_x[inside_x]][:, centres_y[inside_y]]
+    land[np.ix_(inside_y, inside_x)] = np.all(samples == 0, axis=-1).T
+    return land
+
+
+def blocked_mask(blocked_cells):
+    """Rasterise a set of (grid_x, grid_y) cells into a boolean array."""
+    mask = np.zeros((GRID_ROWS, GRID_COLS), dtype=bool)
+    for x, y in blocked_cells:
+        if 0 <= x < GRID_COLS and 0 <= y < GRID_ROWS:
+            mask[y, x] = True
+    return mask
+
+
+def build_navigability_mask(background_path=BACKGROUND_IMAGE, foreground_path=FOREGROUND_IMAGE,
+                            blocked_cells=None, depth_file=DEPTH_RASTER_FILE):
+    """
+    Build the navigability raster from its inputs.
+
+    Returns:
+        np.ndarray: Boolean array of shape (GRID_ROWS, GRID_COLS), True where a ship may go.
+    """
+    if blocked_cells is None:
+        blocked_cells = storage.Backup_black_cells
+    land = load_land_mask(background_path, foreground_path)
+    depth = load_depth_grid(depth_file)
+    return ~land & ~blocked_mask(blocked_cells) & (depth < MAX_NAVIGABLE_DEPTH)
+
+
+def _file_signature(path):
+    if not os.path.exists(path):
+        return f"{path}:missing"
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def input_signature(background_path=BACKGROUND_IMAGE, foreground_path=FOREGROUND_IMAGE,
+                    blocked_cells=None, depth_file=DEPTH_RASTER_FILE):
+    """
+    Hash everything the raster depends on.
+
+    Files are identified by size and modification time, the blocked cells by
+    their sorted contents.
+    """
+    if blocked_cells is None:
+        blocked_cells = storage.Backup_black_cells
+    digest = hashlib.sha1()
+    for part in (_file_signature(background_path), _file_signature(foreground_path),
+                 _file_signature(depth_file), repr(sorted(blocked_cells)),
+                 f"{GRID_ROWS}x{GRID_COLS}:{MAX_NAVIGABLE_DEPTH}"):
+        digest.update(part.encode())
+    return digest.hexdigest()
+
+
+def load_navigability_mask(cache_file=CACHE_FILE, **inputs):
+    """
+    Load the navigability raster from the cache, rebuilding it if any input changed.
+
+    Args:
+        cache_file (str): Path of the .npz cache.
+        **inputs: Optional overrides passed to build_navigability_mask.
+
+    Returns:
+        np.ndarray: Boolean array of shape (GRID_ROWS, GRID_COLS), True where a ship may go.
+    """
+    signature = input_signature(**inputs)
+    if os.path.exists(cache_file):
+        try:
+            with np.load(cache_file) as cached:
+                if str(cached["signature"]) == signature:
+                    return cached["mask"]
+        except (OSError, KeyError, ValueError):
+            pass  # Unreadable cache, rebuild below
+
+    mask = build_navigability_mask(**inputs)
+    np.savez_compressed(cache_file, mask=mask, signature=np.array(signature))
+    print(f"Navigability mask rebuilt and saved to {cache_file}")
+    return mask
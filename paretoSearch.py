@@ -0,0 +1,175 @@
+"""
+Multi-objective Pareto search.
+
+Each mode weighs distance, heuristic exposure and wind/current alignment
+differently, so comparing modes used to take one search per mode. Here every
+partial route carries a cost vector over costTensor.OBJECTIVES instead, and a
+cell keeps every label (cost vector plus parent label) that no other label
+there dominates. Labels are expanded in lexicographic order of their estimated
+total vector, so a label at the end cell is never dominated by one found later,
+and a single pass yields the whole Pareto front.
+
+The exact front can hold a huge number of near-identical routes, so dominance
+is taken with a relative tolerance epsilon: a label is dropped when another is
+at most (1 + epsilon) times worse in no objective. epsilon=0 gives the exact front.
+"""
+import math
+from heapq import heappush, heappop
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, path_length
+from costTensor import OBJECTIVES, objective_tensor, edge_cost_tensor, lower_bound_scale
+
+# Relative tolerance of the approximate Pareto front
+DEFAULT_EPSILON = 0.05
+# Most labels kept per cell, the cheapest by distance first
+DEFAULT_MAX_LABELS = 8
+
+
+def _dominated(costs, labels, epsilon):
+    """Return True if any cost vector in labels epsilon-dominates costs."""
+    for other in labels:
+        for mine, theirs in zip(costs, other):
+            if theirs > mine * (1 + epsilon):
+                break
+        else:
+            return True
+    return False
+
+
+def _route_cost(edge_costs, start, path):
+    """Sum of a mode's move costs along a path walked from start."""
+    total = 0.0
+    x, y = start
+    for nx, ny in path:
+        total += float(edge_costs[y, x, DIRECTIONS.index((nx - x, ny - y))])
+        x, y = nx, ny
+    return total
+
+
+def pareto_search(navigable, start, end, weights, heuristic, alignment, on_expand=None,
+                  objectives=None, edge_costs=None, epsilon=DEFAULT_EPSILON, max_labels=DEFAULT_MAX_LABELS):
+    """
+    Find the Pareto front of routes over distance, exposure and penalty.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight), only used
+            to pick which front route is returned as the path.
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        objectives (np.ndarray): Precomputed costTensor.objective_tensor for these inputs.
+        edge_costs (np.ndarray): Precomputed edge_cost_tensor for the mode.
+        epsilon (float): Relative dominance tolerance; 0 for the exact front.
+        max_labels (int): Most labels kept per cell, None for no limit.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict). The path is the front
+        route cheapest under the mode's own move costs; stats['pareto_front']
+        lists every front route as {'path', 'distance', 'exposure', 'penalty'}.
+    """
+    if objectives is None:
+        objectives = objective_tensor(heuristic, alignment, navigable)
+    if edge_costs is None:
+        edge_costs = edge_cost_tensor(weights, heuristic, alignment, navigable)
+    rows, cols, directions, count = objectives.shape
+    end_x, end_y = end
+    costs = np.ascontiguousarray(objectives, dtype=np.float32).reshape(-1, count).tolist()
+    scales = [lower_bound_scale(objectives[:, :, :, i]) for i in range(count)]
+    moves = [(dx, dy, dy * cols + dx) for dx, dy in DIRECTIONS]
+
+    start_id = start[1] * cols + start[0]
+    end_id = end_y * cols + end_x
+    # Label i: cost vector label_costs[i], cell label_cells[i], parent label label_parent[i]
+    label_costs = [(0.0,) * count]
+    label_cells = [start_id]
+    label_parent = [-1]
+    closed_labels = {}  # cell id -> cost vectors of the labels expanded there
+    solutions = []  # labels that reached the end
+    open_heap = [(label_costs[0], 0)]
+
+    explored = []
+    seen = bytearray(rows * cols)
+    pushes = 1
+    stale_pops = 0
+    peak_open = 1
+    labels_expanded = 0
+
+    while open_heap:
+        estimate, label = heappop(open_heap)
+        cell_id = label_cells[label]
+        g = label_costs[label]
+        closed_here = closed_labels.setdefault(cell_id, [])
+        if (_dominated(estimate, [label_costs[s] for s in solutions], epsilon)
+                or _dominated(g, closed_here, epsilon)
+                or (max_labels is not None and len(closed_here) >= max_labels)):
+            stale_pops += 1
+            continue
+        closed_here.append(g)
+        labels_expanded += 1
+
+        y, x = divmod(cell_id, cols)
+        if not seen[cell_id]:
+            seen[cell_id] = 1
+            if cell_id != start_id and cell_id != end_id:
+                explored.append((x, y))
+                if on_expand is not None:
+                    on_expand((x, y))
+
+        if cell_id == end_id:
+            solutions.append(label)
+            continue
+
+        base = cell_id * directions
+        for k, (dx, dy, offset) in enumerate(moves):
+            move = costs[base + k]
+            if move[0] == math.inf:
+                continue
+            neighbor_id = cell_id + offset
+            tentative = tuple(a + b for a, b in zip(g, move))
+            if _dominated(tentative, closed_labels.get(neighbor_id, ()), epsilon):
+                continue
+            remaining = math.hypot(x + dx - end_x, y + dy - end_y)
+            estimate = tuple(a + scale * remaining for a, scale in zip(tentative, scales))
+            label_costs.append(tentative)
+            label_cells.append(neighbor_id)
+            label_parent.append(label)
+            heappush(open_heap, (estimate, len(label_cells) - 1))
+            pushes += 1
+        if len(open_heap) > peak_open:
+            peak_open = len(open_heap)
+
+    front = []
+    for label in solutions:
+        path = []
+        node = label
+        while label_parent[node] != -1:
+            y, x = divmod(label_cells[node], cols)
+            path.append((x, y))
+            node = label_parent[node]
+        path.reverse()
+        front.append({"path": path, **dict(zip(OBJECTIVES, label_costs[label]))})
+    front.sort(key=lambda route: route["distance"])
+
+    stats = {
+        "expanded": len(explored),
+        "labels_expanded": labels_expanded,
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "epsilon": epsilon,
+        "pareto_front": front,
+        "cost": math.inf,
+        "distance": math.inf,
+    }
+    if not front:
+        return None, explored, stats
+
+    path = min((route["path"] for route in front), key=lambda route: _route_cost(edge_costs, start, route))
+    stats["cost"] = _route_cost(edge_costs, start, path)
+    stats["distance"] = path_length(start, path)
+    return path, explored, stats
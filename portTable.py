@@ -0,0 +1,189 @@
+"""
+Precomputed port-to-port route table.
+
+An offline job routes every ordered pair of a port list once per environment
+date, mode and algorithm, and stores the result in a compact .npz table:
+the port cells, float32 cost and distance matrices, and all routes packed into
+one uint16 cell array indexed by per-pair offsets. A RouteEngine built with
+port_tables=True answers queries between two table ports by lookup and falls
+back to live search otherwise.
+
+Tables are only built for PORT_TABLE_ALGORITHMS, whose result is a path with
+its cost and search counters. The other searches report more than a path (a
+Pareto front, an anytime bound, per-direction counts) or depend on more than
+the endpoints, so they always run live.
+
+A table records the data version it was computed from (see
+environmentField.environment_version), so a table left over from older data
+is ignored instead of serving stale routes.
+
+    python portTable.py --modes speed comfort --workers 8
+"""
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+from environmentField import DEFAULT_DATE, environment_version
+from ports import PORTS, port_cells
+
+TABLE_FILE = "port_routes_{date}_{mode}_{algorithm}.npz"
+
+# Searches whose routes a table may stand in for
+PORT_TABLE_ALGORITHMS = ("astar", "jps", "alt")
+
+
+def data_version(engine, date):
+    """Version of the environment files and navigability raster a table is computed from."""
+    return f"{environment_version(date)}:{engine.navigable_version}"
+
+
+class PortTable:
+    """Routes between every ordered pair of a set of port cells."""
+
+    def __init__(self, cells, costs, distances, offsets, route_cells, version=None):
+        """
+        Args:
+            cells (np.ndarray): (N, 2) port cells (grid_x, grid_y).
+            costs (np.ndarray): (N, N) route costs, inf where unreachable and
+                nan for searches that report no cost.
+            distances (np.ndarray): (N, N) route lengths in cells, inf where unreachable.
+            offsets (np.ndarray): (N * N + 1,) start of each pair's route in route_cells.
+            route_cells (np.ndarray): (M, 2) cells of all routes, start excluded.
+            version (str): Data version the routes were computed from.
+        """
+        self.cells = np.asarray(cells)
+        self.costs = costs
+        self.distances = distances
+        self.offsets = offsets
+        self.route_cells = route_cells
+        self.version = version
+        self.index = {(int(x), int(y)): i for i, (x, y) in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.index)
+
+    def lookup(self, start, end):
+        """
+        Route between two table cells.
+
+        Returns:
+            tuple: (path or None if unreachable, cost, distance), or None if
+            start or end is not a table cell.
+        """
+        i = self.index.get(tuple(start))
+        j = self.index.get(tuple(end))
+        if i is None or j is None or i == j:
+            return None
+        pair = i * len(self.cells) + j
+        cost, distance = float(self.costs[i, j]), float(self.distances[i, j])
+        if not math.isfinite(distance):
+            return None, cost, distance
+        path = [(int(x), int(y)) for x, y in self.route_cells[self.offsets[pair]:self.offsets[pair + 1]]]
+        return path, cost, distance
+
+    def save(self, table_file):
+        np.savez_compressed(table_file, cells=self.cells, costs=self.costs, distances=self.distances,
+                            offsets=self.offsets, route_cells=self.route_cells, version=np.array(self.version))
+
+    @classmethod
+    def load(cls, table_file):
+        with np.load(table_file) as data:
+            return cls(data["cells"], data["costs"], data["distances"], data["offsets"], data["route_cells"],
+                       str(data["version"]))
+
+
+def build_port_table(engine, date=DEFAULT_DATE, mode="speed", algorithm="astar", ports=None, workers=None):
+    """
+    Route every ordered pair of ports with route_batch.
+
+    Args:
+        engine (RouteEngine): Engine whose data the routes are computed on.
+        date (str): Environment date.
+        mode (str): Routing mode.
+        algorithm (str): Search algorithm the table answers for, one of PORT_TABLE_ALGORITHMS.
+        ports (dict): Name -> (latitude, longitude); defaults to ports.PORTS.
+        workers (int): Worker processes; defaults to the CPU count.
+
+    Returns:
+        PortTable: The routes, with the data version they were computed from.
+    """
+    from batchRouting import route_batch  # batchRouting imports routeEngine, which imports this module
+
+    if algorithm not in PORT_TABLE_ALGORITHMS:
+        raise ValueError(f"Port tables are not built for {algorithm}; use one of {', '.join(PORT_TABLE_ALGORITHMS)}")
+    cells = sorted(set(port_cells(engine.navigable, ports).values()))
+    count = len(cells)
+    pairs = [(i, j) for i in range(count) for j in range(count) if i != j]
+    jobs = [(cells[i], cells[j], mode) for i, j in pairs]
+
+    costs = np.full((count, count), np.inf, dtype=np.float32)
+    distances = np.full((count, count), np.inf, dtype=np.float32)
+    np.fill_diagonal(costs, 0)
+    np.fill_diagonal(distances, 0)
+    paths = {}
+    for index, result in route_batch(jobs, engine=engine, date=date, algorithm=algorithm, workers=workers):
+        i, j = pairs[index]
+        paths[i * count + j] = result.path or []
+        # Searches over the calculate_fscore priority report no cost
+        distances[i, j] = result.stats["distance"] if result.found else np.inf
+        costs[i, j] = result.stats.get("cost", np.nan) if result.found else np.inf
+
+    offsets = np.zeros(count * count + 1, dtype=np.int32)
+    for pair in range(count * count):
+        offsets[pair + 1] = offsets[pair] + len(paths.get(pair, ()))
+    route_cells = np.array([cell for pair in range(count * count) for cell in paths.get(pair, ())],
+                           dtype=np.uint16).reshape(-1, 2)
+    return PortTable(np.array(cells, dtype=np.uint16).reshape(-1, 2), costs, distances, offsets, route_cells,
+                     data_version(engine, date))
+
+
+def load_port_table(engine, date, mode, algorithm):
+    """
+    The table for a date, mode and algorithm if one exists for the current data.
+
+    Returns:
+        PortTable or None
+    """
+    table_file = TABLE_FILE.format(date=date, mode=mode, algorithm=algorithm)
+    if not os.path.exists(table_file):
+        return None
+    try:
+        table = PortTable.load(table_file)
+    except (OSError, KeyError, ValueError):
+        return None
+    if table.version != data_version(engine, date):
+        print(f"Ignoring {table_file}: the environment data has changed since it was built")
+        return None
+    return table
+
+
+def main():
+    from routeEngine import RouteEngine, MODES
+
+    parser = argparse.ArgumentParser(description="Precompute routes between every pair of ports.")
+    parser.add_argument("--dates", nargs="+", default=[DEFAULT_DATE])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--algorithm", default="astar", choices=PORT_TABLE_ALGORITHMS)
+    parser.add_argument("--ports", help="JSON file mapping port names to [latitude, longitude]")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    ports = PORTS
+    if args.ports:
+        with open(args.ports) as f:
+            ports = {name: tuple(position) for name, position in json.load(f).items()}
+
+    engine = RouteEngine(args.dates[0])
+    for date in args.dates:
+        for mode in args.modes:
+            table = build_port_table(engine, date, mode, args.algorithm, ports, args.workers)
+            table_file = TABLE_FILE.format(date=date, mode=mode, algorithm=args.algorithm)
+            table.save(table_file)
+            print(f"{len(table)} ports, {len(table.route_cells)} route cells saved to {table_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Major ports around the Indian coast, located on the routing grid.
+
+Port coordinates rarely fall exactly on a navigable cell, so each port is
+snapped to the nearest cell of open sea: the largest connected body of
+navigable water, which leaves out lakes and pockets enclosed by the land mask.
+"""
+from collections import deque
+
+import numpy as np
+
+from gridSearch import DIRECTIONS
+from CoordConv import latitude_to_grid, longitude_to_grid
+
+# Port name -> (latitude, longitude)
+PORTS = {
+    "Kandla": (23.0, 70.2),
+    "Mumbai": (18.95, 72.85),
+    "Mormugao": (15.41, 73.8),
+    "New Mangalore": (12.92, 74.8),
+    "Kochi": (9.97, 76.25),
+    "Tuticorin": (8.75, 78.2),
+    "Colombo": (6.95, 79.85),
+    "Chennai": (13.1, 80.3),
+    "Visakhapatnam": (17.7, 83.3),
+    "Paradip": (20.26, 86.67),
+    "Haldia": (22.03, 88.1),
+    "Port Blair": (11.67, 92.75),
+}
+
+
+def open_sea_mask(navigable):
+    """
+    Largest 8-connected region of navigable cells.
+
+    Returns:
+        np.ndarray: Boolean (rows, cols) array.
+    """
+    rows, cols = navigable.shape
+    label = np.zeros((rows, cols), dtype=np.int32)
+    sizes = [0]
+    for y, x in np.argwhere(navigable).tolist():
+        if label[y, x]:
+            continue
+        region = len(sizes)
+        label[y, x] = region
+        size = 0
+        queue = deque([(x, y)])
+        while queue:
+            cx, cy = queue.popleft()
+            size += 1
+            for dx, dy in DIRECTIONS:
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < cols and 0 <= ny < rows and navigable[ny, nx] and not label[ny, nx]:
+                    label[ny, nx] = region
+                    queue.append((nx, ny))
+        sizes.append(size)
+    if len(sizes) == 1:
+        return np.zeros((rows, cols), dtype=bool)
+    return label == int(np.argmax(sizes))
+
+
+def nearest_navigable(cell, navigable):
+    """Return the cell of a boolean mask closest to cell (grid_x, grid_y), or None if there is none."""
+    candidates = np.argwhere(navigable)
+    if len(candidates) == 0:
+        return None
+    x, y = cell
+    nearest = candidates[np.argmin((candidates[:, 0] - y) ** 2 + (candidates[:, 1] - x) ** 2)]
+    return int(nearest[1]), int(nearest[0])
+
+
+def port_cells(navigable, ports=None):
+    """
+    Grid cells of the ports, snapped to open sea.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        ports (dict): Name -> (latitude, longitude); defaults to PORTS.
+
+    Returns:
+        dict: Port name -> (grid_x, grid_y).
+    """
+    sea = open_sea_mask(navigable)
+    cells = {}
+    for name, (latitude, longitude) in (ports or PORTS).items():
+        cell = nearest_navigable((longitude_to_grid(longitude), latitude_to_grid(latitude)), sea)
+        if cell is not None:
+            cells[name] = cell
+    return cells
@@ -0,0 +1,196 @@
+"""
+Routing benchmark over a fixed voyage corpus.
+
+Every voyage of VOYAGES is routed in every mode with each chosen algorithm,
+headless through RouteEngine. Each case is routed once untimed so lazily built
+inputs (cost tensors, HPA* graphs, landmarks) are not counted, then timed over
+several repeats, and once more under tracemalloc for its peak memory. Results
+are written as JSON so runs can be compared with --compare.
+
+    python routeBenchmark.py --algorithms astar jps --repeats 5
+    python routeBenchmark.py --compare benchmark_old.json --output benchmark_new.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Never open a window
+
+import numpy as np
+
+from routeEngine import RouteEngine, MODES, SEARCH_ALGORITHMS
+from environmentField import DEFAULT_DATE, environment_version
+from ports import port_cells
+
+# Region -> (origin port, destination port) voyages
+VOYAGES = {
+    "west coast": [("Kandla", "Mumbai"), ("Mumbai", "Kochi"), ("Mormugao", "New Mangalore")],
+    "east coast": [("Chennai", "Visakhapatnam"), ("Visakhapatnam", "Haldia"), ("Paradip", "Chennai")],
+    "around Sri Lanka": [("Kochi", "Chennai"), ("Mumbai", "Visakhapatnam"), ("Colombo", "Paradip")],
+    "Andamans": [("Chennai", "Port Blair"), ("Colombo", "Port Blair"), ("Haldia", "Port Blair")],
+}
+
+PERCENTILES = (50, 90, 99)
+DEFAULT_REPEATS = 5
+
+
+def voyage_corpus(navigable):
+    """
+    Resolve VOYAGES to grid cells.
+
+    Returns:
+        list: Dicts with 'voyage', 'region', 'start' and 'end' cells.
+    """
+    cells = port_cells(navigable)
+    corpus = []
+    for region, voyages in VOYAGES.items():
+        for origin, destination in voyages:
+            corpus.append({"voyage": f"{origin} -> {destination}", "region": region,
+                           "start": cells[origin], "end": cells[destination]})
+    return corpus
+
+
+def benchmark_case(engine, start, end, mode, algorithm, date=DEFAULT_DATE, repeats=DEFAULT_REPEATS):
+    """
+    Time one voyage in one mode with one algorithm.
+
+    Returns:
+        dict: Latency percentiles in milliseconds, search counters, route
+        cost and length, and the peak memory allocated during the search.
+    """
+    engine.route(start, end, mode, date=date, algorithm=algorithm)  # Build cached inputs untimed
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = engine.route(start, end, mode, date=date, algorithm=algorithm)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    engine.route(start, end, mode, date=date, algorithm=algorithm)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = result.stats
+    return {
+        "latency_ms": {
+            **{f"p{p}": float(np.percentile(latencies, p)) for p in PERCENTILES},
+            "mean": float(np.mean(latencies)),
+            "min": float(np.min(latencies)),
+        },
+        "found": result.found,
+        "expanded": stats.get("expanded"),
+        "pushes": stats.get("pushes"),
+        "peak_open": stats.get("peak_open"),
+        "cost": stats.get("cost"),
+        "distance": stats.get("distance"),
+        "path_cells": stats.get("path_cells"),
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def run_benchmark(engine=None, algorithms=("astar",), modes=MODES, date=DEFAULT_DATE,
+                  repeats=DEFAULT_REPEATS, progress=print):
+    """
+    Benchmark every voyage of the corpus in every mode with each algorithm.
+
+    Args:
+        engine (RouteEngine): Engine to route with, without a route cache or port
+            tables so every case is searched; one is built if None.
+        algorithms (iterable): Keys of SEARCH_ALGORITHMS.
+        modes (iterable): Routing modes.
+        date (str): Environment date.
+        repeats (int): Timed routes per case.
+        progress (callable): Called with a line of text after each case, or None.
+
+    Returns:
+        dict: Run metadata and a 'results' list with one entry per case.
+    """
+    if engine is None:
+        engine = RouteEngine(date)
+    if engine.cache is not None or engine.port_tables:
+        raise ValueError("Benchmark with an engine without a route cache or port tables")
+    for algorithm in algorithms:
+        if algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm: {algorithm}")
+
+    results = []
+    corpus = voyage_corpus(engine.navigable)
+    for algorithm in algorithms:
+        for mode in modes:
+            for voyage in corpus:
+                case = benchmark_case(engine, voyage["start"], voyage["end"], mode, algorithm, date, repeats)
+                results.append({**voyage, "mode": mode, "algorithm": algorithm, **case})
+                if progress is not None:
+                    progress(f"{algorithm:>13} {mode:>9} {voyage['voyage']:<28} "
+                             f"p50 {case['latency_ms']['p50']:8.2f} ms  {case['expanded']} expanded")
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "date": date,
+        "environment_version": environment_version(date),
+        "navigable_version": engine.navigable_version,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def compare_runs(baseline, current):
+    """
+    Compare two benchmark runs case by case.
+
+    Returns:
+        list: (case key, baseline p50, current p50, p50 ratio, baseline
+        expanded, current expanded) for every case present in both runs.
+    """
+    def key(result):
+        return result["algorithm"], result["mode"], result["voyage"]
+
+    before = {key(result): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        old_p50, new_p50 = old["latency_ms"]["p50"], result["latency_ms"]["p50"]
+        rows.append((key(result), old_p50, new_p50, new_p50 / old_p50 if old_p50 else float("nan"),
+                     old["expanded"], result["expanded"]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark routing over a fixed voyage corpus.")
+    parser.add_argument("--algorithms", nargs="+", default=["astar"], choices=sorted(SEARCH_ALGORITHMS))
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--date", default=DEFAULT_DATE)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--output", help="JSON results file; benchmark_<timestamp>.json by default")
+    parser.add_argument("--compare", help="Earlier results file to compare this run with")
+    args = parser.parse_args()
+
+    run = run_benchmark(algorithms=args.algorithms, modes=args.modes, date=args.date, repeats=args.repeats)
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"Results for {len(run['results'])} cases saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_runs(baseline, run)
+        for (algorithm, mode, voyage), old_p50, new_p50, ratio, old_expanded, new_expanded in rows:
+            print(f"{algorithm:>13} {mode:>9} {voyage:<28} p50 {old_p50:8.2f} -> {new_p50:8.2f} ms "
+                  f"(x{ratio:.2f})  expanded {old_expanded} -> {new_expanded}")
+        if rows:
+            ratios = [row[3] for row in rows]
+            print(f"Median p50 ratio over {len(rows)} cases: x{float(np.median(ratios)):.2f}")
+
+
+if __name__ == "__main__":
+    main()
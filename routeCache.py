@@ -0,0 +1,87 @@
+"""
+LRU cache of route results.
+
+Entries are keyed by environment date, data version, endpoints, mode,
+algorithm and search options. The data version hashes the environment files
+and the navigability raster, so routes computed on data that has since been
+regenerated are never served; RouteEngine also prunes them when it notices a
+new version. The cache can be persisted to a pickle file between sessions.
+"""
+import os
+import pickle
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 512
+CACHE_FILE = "route_cache.pkl"
+
+
+def route_key(date, version, start, end, mode, algorithm, options):
+    """Build the cache key of a route query."""
+    return (date, version, tuple(start), tuple(end), mode, algorithm, repr(sorted(options.items())))
+
+
+class RouteCache:
+    """
+    Bounded least-recently-used store of (path, stats) per route key.
+
+    Explored cells are not kept; a cache hit has nothing to animate.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_file=None):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted.
+            cache_file (str): Optional pickle file to load from now and save() to later.
+        """
+        self.max_entries = max_entries
+        self.cache_file = cache_file
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cache_file and os.path.exists(cache_file):
+            self.load(cache_file)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return the cached (path, stats) for a key, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, path, stats):
+        """Store a route, evicting the least recently used entries beyond max_entries."""
+        self.entries[key] = (path, dict(stats))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def prune(self, date, version):
+        """Drop every entry for a date that was computed on another data version."""
+        stale = [key for key in self.entries if key[0] == date and key[1] != version]
+        for key in stale:
+            del self.entries[key]
+        return len(stale)
+
+    def clear(self):
+        self.entries.clear()
+
+    def load(self, cache_file=None):
+        """Load entries from a pickle file; an unreadable file leaves the cache empty."""
+        try:
+            with open(cache_file or self.cache_file, 'rb') as f:
+                entries = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print(f"Could not load route cache: {e}")
+            return
+        self.entries = OrderedDict(list(entries.items())[-self.max_entries:])
+
+    def save(self, cache_file=None):
+        """Write the entries to a pickle file."""
+        with open(cache_file or self.cache_file, 'wb') as f:
+            pickle.dump(self.entries, f)
@@ -0,0 +1,363 @@
+"""
+Headless routing engine.
+
+Computes ship routes over the map grid without a pygame display, so routes can
+be run on servers and in batch jobs. The pygame UI in ActualMain.py is just one
+consumer of RouteEngine.route().
+"""
+import hashlib
+import math
+import time
+
+from navigability import load_navigability_mask
+from gridSearch import a_star_search
+from bidirectionalSearch import bidirectional_search
+from hierarchicalSearch import hierarchical_search, load_abstract_graph
+from incrementalSearch import DStarLite, d_star_lite_search
+from timeDependentSearch import time_dependent_search, build_cost_cube
+from landmarkHeuristic import landmark_search, load_landmarks
+from paretoSearch import pareto_search
+from anyAngleSearch import theta_star_search
+from anytimeSearch import anytime_search
+from multiResolutionSearch import multi_resolution_search, build_pyramid
+from jumpPointSearch import jump_point_search, jump_tables
+from costTensor import build_alignment_tensor, edge_cost_tensor, objective_tensor
+from environmentField import EnvironmentField, DEFAULT_DATE, environment_version, forecast_dates
+from routeCache import route_key
+from searchMetrics import PHASE_ALGORITHMS
+from portTable import PORT_TABLE_ALGORITHMS, load_port_table
+from ports import port_cells
+from CoordConv import GRID_COLS, GRID_ROWS
+
+# f-score weights per mode: (g_score, distance to end, heuristic)
+MODE_WEIGHTS = {
+    "cargo": (0.3, 0.7, 0.1),
+    "passenger": (0.3, 0.2, 1.0),
+    "fuel": (0.4, 0.2, 0.1),
+    "speed": (0.3, 0.7, 0.1),
+    "comfort": (0.3, 0.2, 1.0),
+    "none": (0.0, 0.0, 0.0),  # nothing selected in the UI
+}
+MODES = ("cargo", "passenger", "fuel", "speed", "comfort")
+
+# Search algorithms selectable per query; all share a_star_search's signature
+SEARCH_ALGORITHMS = {
+    "astar": a_star_search,
+    "bidirectional": bidirectional_search,
+    "hpa": hierarchical_search,
+    "jps": jump_point_search,
+    "dstar": d_star_lite_search,
+    "timed": time_dependent_search,
+    "alt": landmark_search,
+    "pareto": pareto_search,
+    "theta": theta_star_search,
+    "anytime": anytime_search,
+    "multires": multi_resolution_search,
+}
+
+# On-disk cache of the HPA* abstract graph per environment date and mode
+HPA_CACHE_FILE = "hpa_graph_{date}_{mode}.pkl"
+# On-disk cache of the ALT landmark distances per environment date and mode
+LANDMARK_CACHE_FILE = "landmarks_{date}_{mode}.npz"
+
+
+def mode_from_ui(is_first_box_green, is_second_box_green, horizontal_buttons):
+    """
+    Translate the UI toggles into a routing mode name.
+
+    Args:
+        is_first_box_green (bool): Cargo toggle.
+        is_second_box_green (bool): Passenger toggle.
+        horizontal_buttons (list): Fuel / Speed / Comfort button states.
+
+    Returns:
+        str: One of MODE_WEIGHTS' keys.
+    """
+    if is_first_box_green:
+        return "cargo"
+    if is_second_box_green:
+        return "passenger"
+    for name, selected in zip(("fuel", "speed", "comfort"), horizontal_buttons):
+        if selected:
+            return name
+    return "none"
+
+
+class RouteResult:
+    """Outcome of a single route query."""
+
+    def __init__(self, path, explored, stats):
+        self.path = path  # list of (grid_x, grid_y), start excluded, or None
+        self.explored = explored  # cells in the order they were expanded
+        self.stats = stats
+
+    @property
+    def found(self):
+        return self.path is not None
+
+
+class RouteEngine:
+    """
+    Computes routes between grid cells for a mode and environment date.
+
+    Environment data is loaded once per date and kept for later queries. With a
+    RouteCache attached, repeated queries are answered from the cache, and a
+    date's data is reloaded as soon as its files are regenerated. With
+    port_tables, queries between two ports of a precomputed portTable are
+    answered by lookup for the algorithms of PORT_TABLE_ALGORITHMS.
+    """
+
+    def __init__(self, date=DEFAULT_DATE, navigable=None, fields=(), cache=None, port_tables=False, tensors=None):
+        """
+        Args:
+            date (str): Environment date to load up front.
+            navigable (np.ndarray): Navigability raster; loaded from its cache if None.
+            fields (iterable): Already built EnvironmentFields to use instead of loading their dates.
+            cache (RouteCache): Optional route result cache.
+            port_tables (bool): Answer port-to-port queries from precomputed port tables.
+            tensors (dict): Date -> already built tensors of one of the fields, keyed
+                like its environment ('alignment', ('edge_costs', mode)).
+        """
+        self.navigable = load_navigability_mask() if navigable is None else navigable
+        self.navigable_version = hashlib.sha1(self.navigable.tobytes()).hexdigest()
+        self.cache = cache
+        self.port_tables = port_tables
+        self._environments = {}
+        tensors = tensors or {}
+        for field in fields:
+            self._environment(field.date, field, tensors.get(field.date))
+        self._environment(date)
+
+    def _environment(self, date, field=None, tensors=None):
+        """Load (or reuse) the environment field and alignment tensor for a date."""
+        if date not in self._environments:
+            if field is None:
+                field = EnvironmentField.load(date)
+            env = {"version": environment_version(date), "field": field, **(tensors or {})}
+            if "alignment" not in env:
+                env["alignment"] = build_alignment_tensor(field.layer("wind_direction"), field.layer("current_angle"))
+            self._environments[date] = env
+        return self._environments[date]
+
+    def _refresh(self, date):
+        """Reload a date's environment if its files changed since loading; return their version."""
+        version = environment_version(date)
+        if self._environment(date)["version"] != version:
+            del self._environments[date]
+            self._environment(date)
+        return version
+
+    def _data_version(self, date):
+        """
+        Version of the data a route on this date is computed from.
+
+        Reloads the date's environment if its files changed since they were
+        loaded, and drops cached routes computed on other versions.
+        """
+        version = self._refresh(date)
+        data_version = f"{version}:{self.navigable_version}"
+        if self._environments[date].get("cache_version") != data_version:
+            self.cache.prune(date, data_version)
+            self._environments[date]["cache_version"] = data_version
+        return data_version
+
+    def _edge_costs(self, date, mode):
+        """Additive move costs for a date and mode, computed once."""
+        env = self._environment(date)
+        key = ("edge_costs", mode)
+        if key not in env:
+            env[key] = edge_cost_tensor(MODE_WEIGHTS[mode], env["field"].layer("heuristic"),
+                                        env["alignment"], self.navigable)
+        return env[key]
+
+    def _search_inputs(self, algorithm, date, mode):
+        """Precomputed structures an algorithm takes on top of the shared inputs."""
+        env = self._environment(date)
+        if algorithm == "hpa":
+            key = ("hpa", mode)
+            if key not in env:
+                env[key] = load_abstract_graph(self._edge_costs(date, mode), HPA_CACHE_FILE.format(date=date, mode=mode))
+            return {"edge_costs": self._edge_costs(date, mode), "graph": env[key]}
+        if algorithm == "timed":
+            # Forecast days from this date on, stacked once per mode
+            dates = forecast_dates(date)
+            key = ("cube", mode, tuple(dates))
+            if key not in env:
+                env[key] = build_cost_cube([self._edge_costs(day, mode) for day in dates])
+            return {"cost_cube": env[key], "dates": dates}
+        if algorithm in ("dstar", "theta", "anytime"):
+            return {"edge_costs": self._edge_costs(date, mode)}
+        if algorithm == "alt":
+            key = ("landmarks", mode)
+            if key not in env:
+                env[key] = load_landmarks(self._edge_costs(date, mode), list(port_cells(self.navigable).values()),
+                                          LANDMARK_CACHE_FILE.format(date=date, mode=mode))
+            return {"edge_costs": self._edge_costs(date, mode), "landmarks": env[key]}
+        if algorithm == "pareto":
+            # Objectives do not depend on the mode, which only picks the returned route
+            if "objectives" not in env:
+                env["objectives"] = objective_tensor(env["field"].layer("heuristic"), env["alignment"], self.navigable)
+            return {"objectives": env["objectives"], "edge_costs": self._edge_costs(date, mode)}
+        if algorithm == "multires":
+            key = ("pyramid", mode)
+            if key not in env:
+                env[key] = build_pyramid(self._edge_costs(date, mode), self.navigable)
+            return {"pyramid": env[key]}
+        if algorithm == "jps":
+            key = ("jps", mode)
+            if key not in env:
+                env[key] = jump_tables(self._edge_costs(date, mode), self.navigable)
+            return {"edge_costs": self._edge_costs(date, mode), "tables": env[key]}
+        return {}
+
+    def _port_table(self, date, mode, algorithm):
+        """Precomputed port-to-port table for a date, mode and algorithm, or None; read from disk once."""
+        env = self._environment(date)
+        key = ("port_table", mode, algorithm)
+        if key not in env:
+            env[key] = load_port_table(self, date, mode, algorithm)
+        return env[key]
+
+    def start_replanning(self, start, end, mode, date=DEFAULT_DATE, on_expand=None):
+        """
+        Plan a route whose search state is kept for incremental repairs.
+
+        Returns:
+            tuple: (DStarLite planner to pass to replan(), RouteResult)
+        """
+        if mode not in MODE_WEIGHTS:
+            raise ValueError(f"Unknown routing mode: {mode}")
+        self._check_endpoints(start, end)
+        planner = DStarLite(self._edge_costs(date, mode), start, end)
+        planner.mode = mode
+        return planner, self._planner_result(planner, date, on_expand)
+
+    def replan(self, planner, date=DEFAULT_DATE, position=None, on_expand=None):
+        """
+        Repair a route after the environment changed or the vessel moved.
+
+        Args:
+            planner (DStarLite): Planner from start_replanning.
+            date (str): Environment date to route on now, e.g. the next forecast day.
+            position (tuple): Current vessel cell, if it has moved.
+            on_expand (callable): Optional callback invoked with every expanded cell.
+
+        Returns:
+            RouteResult: The repaired route from the vessel's position.
+        """
+        self._refresh(date)
+        if position is not None:
+            self._check_endpoints(position)
+            planner.move_to(position)
+        planner.update_costs(self._edge_costs(date, planner.mode))
+        return self._planner_result(planner, date, on_expand)
+
+    def _planner_result(self, planner, date, on_expand):
+        started = time.perf_counter()
+        path, explored, stats = planner.plan(on_expand)
+        stats.update({
+            "algorithm": "dstar",
+            "mode": planner.mode,
+            "date": date,
+            "path_cells": len(path) if path else 0,
+            "elapsed": time.perf_counter() - started,
+        })
+        return RouteResult(path, explored, stats)
+
+    def _check_endpoints(self, *cells):
+        """Raise ValueError unless every cell lies on the routing grid."""
+        for cell in cells:
+            x, y = cell
+            if not (0 <= x < GRID_COLS and 0 <= y < GRID_ROWS):
+                raise ValueError(f"Cell {tuple(cell)} is outside the {GRID_COLS}x{GRID_ROWS} routing grid")
+
+    def is_navigable(self, x, y):
+        """Return True if a ship may enter grid cell (x, y)."""
+        if not (0 <= x < GRID_COLS and 0 <= y < GRID_ROWS):
+            return False
+        return bool(self.navigable[y, x])
+
+    def route(self, start, end, mode, date=DEFAULT_DATE, on_expand=None, algorithm="astar", metrics=None,
+              cached=True, **options):
+        """
+        Find a route from start to end.
+
+        Args:
+            start (tuple): Start cell (grid_x, grid_y).
+            end (tuple): End cell (grid_x, grid_y).
+            mode (str): Routing mode, a key of MODE_WEIGHTS.
+            date (str): Environment date to route on.
+            on_expand (callable): Optional callback invoked with every expanded cell.
+            algorithm (str): Search algorithm, a key of SEARCH_ALGORITHMS.
+            metrics (SearchMetrics): Collects phase times and counters for this
+                route, in-loop phases for searchMetrics.PHASE_ALGORITHMS; the
+                cache and port tables are bypassed so the search really runs.
+            cached (bool): Whether the route cache and port tables may answer;
+                False always runs the search.
+            **options: Extra keyword arguments for the chosen algorithm.
+
+        Returns:
+            RouteResult: The path (None if unreachable) and search statistics.
+        """
+        if mode not in MODE_WEIGHTS:
+            raise ValueError(f"Unknown routing mode: {mode}")
+        if algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm: {algorithm}")
+        self._check_endpoints(start, end)
+        cached = cached and metrics is None
+        use_cache = self.cache is not None and cached
+        if use_cache:
+            lookup_started = time.perf_counter()
+            key = route_key(date, self._data_version(date), start, end, mode, algorithm, options)
+            hit = self.cache.get(key)
+            if hit is not None:
+                path, stats = hit
+                return RouteResult(list(path) if path is not None else None, [],
+                                   {**stats, "cached": True, "elapsed": time.perf_counter() - lookup_started})
+
+        if self.port_tables and cached and algorithm in PORT_TABLE_ALGORITHMS and not options:
+            lookup_started = time.perf_counter()
+            table = self._port_table(date, mode, algorithm)
+            hit = table.lookup(start, end) if table is not None else None
+            if hit is not None:
+                path, cost, distance = hit
+                stats = {"expanded": 0, "distance": distance}
+                if not math.isnan(cost):
+                    stats["cost"] = cost
+                return RouteResult(path, [], {
+                    **stats, "algorithm": algorithm, "mode": mode, "date": date,
+                    "path_cells": len(path) if path else 0, "port_table": True,
+                    "elapsed": time.perf_counter() - lookup_started,
+                })
+
+        prepare_started = time.perf_counter()
+        env = self._environment(date)
+        search_options = {**self._search_inputs(algorithm, date, mode), **options}
+        search = SEARCH_ALGORITHMS[algorithm]
+        if metrics is not None:
+            metrics.add("prepare", time.perf_counter() - prepare_started)
+            if algorithm in PHASE_ALGORITHMS:
+                search_options["metrics"] = metrics
+        started = time.perf_counter()
+
+        path, explored, stats = search(
+            self.navigable, start, end, MODE_WEIGHTS[mode],
+            env["field"].layer("heuristic"),
+            env["alignment"],
+            on_expand=on_expand,
+            **search_options,
+        )
+
+        stats.update({
+            "algorithm": algorithm,
+            "mode": mode,
+            "date": date,
+            "path_cells": len(path) if path else 0,
+            "elapsed": time.perf_counter() - started,
+        })
+        if metrics is not None:
+            metrics.add("search", stats["elapsed"])
+            metrics.record(stats)
+        if use_cache:
+            self.cache.put(key, path, stats)
+        return RouteResult(path, explored, stats)
@@ -0,0 +1,138 @@
+"""
+Search instrumentation: counters, phase timers and profiler hooks.
+
+Every search already reports its counters (expanded, pushes, stale pops, peak
+open set size) in its stats. Passing a SearchMetrics to RouteEngine.route times
+the engine's own phases (prepare, search) for every algorithm, and for those in
+PHASE_ALGORITHMS also the phases inside the search loop: the A* loops of
+gridSearch (a_star_search, and cost_a_star that "hpa", "alt" and "multires" run
+on) take the metrics and time neighbour generation, heuristic, environment
+lookup and queue. The other searches have their own loops and report only the
+engine phases and counters. Without metrics the loops skip their timers.
+
+Timing a few dozen nanoseconds of work with perf_counter costs about as much as
+the work itself, so the timer overhead is measured once and subtracted.
+"""
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+
+# Counters copied from a search's stats
+COUNTERS = ("expanded", "pushes", "stale_pops", "peak_open")
+# Searches whose loop times its own phases when given metrics
+PHASE_ALGORITHMS = ("astar", "hpa", "alt", "multires")
+
+_timer_overhead = None
+
+
+def timer_overhead():
+    """Seconds one perf_counter() pair adds to a measured interval, measured once."""
+    global _timer_overhead
+    if _timer_overhead is None:
+        clock = time.perf_counter
+        samples = 20000
+        started = clock()
+        for _ in range(samples):
+            clock() - clock()
+        _timer_overhead = (clock() - started) / samples
+    return _timer_overhead
+
+
+class SearchMetrics:
+    """Phase times and counters collected for one or more routes."""
+
+    def __init__(self):
+        self.phases = {}  # phase name -> seconds
+        self.counters = {}  # counter name -> total, peak_open keeps the maximum
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with block as a phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add_search_phases(self, phases, intervals):
+        """
+        Add phase times measured inside a search loop.
+
+        Args:
+            phases (dict): Phase name -> seconds summed over timed intervals.
+            intervals (dict): Phase name -> number of intervals timed; each
+                includes one timer call's worth of overhead, subtracted here.
+        """
+        overhead = timer_overhead()
+        for name, seconds in phases.items():
+            self.add(name, max(0.0, seconds - overhead * intervals.get(name, 0)))
+
+    def record(self, stats):
+        """Accumulate the counters of a search's stats."""
+        for name in COUNTERS:
+            if name in stats:
+                if name == "peak_open":
+                    self.counters[name] = max(self.counters.get(name, 0), stats[name])
+                else:
+                    self.counters[name] = self.counters.get(name, 0) + stats[name]
+
+    def as_dict(self):
+        return {"phases": dict(self.phases), "counters": dict(self.counters)}
+
+
+@contextmanager
+def profiled(profiler):
+    """
+    Run the body of a with block under a profiler.
+
+    Accepts cProfile.Profile or any profiler with enable()/disable(), and
+    sampling profilers with start()/stop() such as pyinstrument's Profiler.
+    """
+    if hasattr(profiler, "enable"):
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+    else:
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+
+
+def profile_route(engine, start, end, mode, profiler=None, **options):
+    """
+    Profile a single RouteEngine.route call.
+
+    The route cache and port tables are bypassed, so the search itself is profiled.
+
+    Args:
+        engine (RouteEngine): Engine to route with.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        mode (str): Routing mode.
+        profiler: Profiler to use; a new cProfile.Profile if None.
+        **options: Extra keyword arguments for engine.route.
+
+    Returns:
+        tuple: (RouteResult, profiler)
+    """
+    if profiler is None:
+        profiler = cProfile.Profile()
+    with profiled(profiler):
+        result = engine.route(start, end, mode, cached=False, **options)
+    return result, profiler
+
+
+def profile_report(profiler, sort="cumulative", limit=25):
+    """Text report of a cProfile.Profile, the top entries sorted by sort."""
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+    return report.getvalue()
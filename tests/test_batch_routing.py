@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import batchRouting
+from environmentField import DEFAULT_DATE
+from ports import port_cells
+from routeEngine import RouteEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return RouteEngine()
+
+
+def test_workers_map_the_parent_tensors(engine, tmp_path):
+    engine._search_inputs("alt", DEFAULT_DATE, "speed")
+    files = batchRouting.export_layers(engine, DEFAULT_DATE, str(tmp_path))
+    assert set(files["tensors"]) == {"alignment", ("edge_costs", "speed")}
+
+    batchRouting._init_worker(files, DEFAULT_DATE)
+    env = batchRouting._worker_engine._environment(DEFAULT_DATE)
+    assert isinstance(env["alignment"], np.memmap)
+    assert isinstance(batchRouting._worker_engine._edge_costs(DEFAULT_DATE, "speed"), np.memmap)
+
+    cells = port_cells(engine.navigable)
+    for algorithm in ("astar", "alt"):
+        expected = engine.route(cells["Mumbai"], cells["Kochi"], "speed", algorithm=algorithm, cached=False)
+        _, path, _, stats = batchRouting._route_job(0, cells["Mumbai"], cells["Kochi"], "speed", DEFAULT_DATE,
+                                                    algorithm, False, {})
+        assert path == expected.path
+        assert stats["distance"] == pytest.approx(expected.stats["distance"])
@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+
+from costTensor import edge_cost_tensor, lower_bound_scale
+from gridSearch import cost_a_star
+from jumpPointSearch import jump_point_search
+
+WEIGHTS = (1, 0, 1)
+
+
+def search_both(navigable, heuristic, alignment, start, end):
+    edge_costs = edge_cost_tensor(WEIGHTS, heuristic, alignment, navigable)
+    jps = jump_point_search(navigable, start, end, WEIGHTS, heuristic, alignment, edge_costs=edge_costs)
+    astar = cost_a_star(edge_costs, start, end, lower_bound_scale(edge_costs))
+    return jps, astar
+
+
+def test_uniform_grid_prunes_symmetric_paths():
+    navigable = np.ones((100, 100), dtype=bool)
+    heuristic = np.zeros((100, 100), dtype=np.float32)
+    alignment = np.ones((100, 100, 8), dtype=np.float32)
+    for start, end in [((5, 5), (90, 70)), ((50, 2), (3, 97)), ((10, 80), (95, 12))]:
+        (path, _, stats), (_, _, astar_stats) = search_both(navigable, heuristic, alignment, start, end)
+        assert path[-1] == end
+        assert math.isclose(stats["cost"], astar_stats["cost"], rel_tol=1e-6)
+        assert stats["expanded"] * 50 < astar_stats["expanded"]
+        assert stats["pushes"] * 50 < astar_stats["pushes"]
+
+
+def test_costs_match_cost_a_star_around_islands_and_cost_changes():
+    rng = np.random.default_rng(7)
+    for _ in range(60):
+        rows, cols = rng.integers(10, 40, 2)
+        navigable = rng.random((rows, cols)) > 0.2
+        heuristic = np.zeros((rows, cols), dtype=np.float32)
+        y, x = rng.integers(0, rows), rng.integers(0, cols)
+        heuristic[y:y + 10, x:x + 10] = rng.random()
+        alignment = np.ones((rows, cols, 8), dtype=np.float32) * rng.choice([0.8, 1.0, 1.2], 8).astype(np.float32)
+        cells = np.argwhere(navigable)
+        start, end = (tuple(int(v) for v in cells[i][::-1]) for i in rng.choice(len(cells), 2, replace=False))
+        (path, _, stats), (astar_path, _, astar_stats) = search_both(navigable, heuristic, alignment, start, end)
+        assert (path is None) == (astar_path is None)
+        if path is not None:
+            assert math.isclose(stats["cost"], astar_stats["cost"], rel_tol=1e-5)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from environmentField import DEFAULT_DATE
+from portTable import PortTable, data_version
+from ports import port_cells
+from routeCache import RouteCache
+from routeEngine import RouteEngine
+
+
+@pytest.fixture(scope="module")
+def engine_and_table():
+    """A Mumbai <-> Kochi table built from live routes, with the engine it belongs to."""
+    engine = RouteEngine()
+    cells = port_cells(engine.navigable)
+    ends = [cells["Mumbai"], cells["Kochi"]]
+    paths = {}
+    distances = np.zeros((2, 2), dtype=np.float32)
+    for i, j in ((0, 1), (1, 0)):
+        result = engine.route(ends[i], ends[j], "speed", cached=False)
+        paths[i * 2 + j] = result.path
+        distances[i, j] = result.stats["distance"]
+    offsets = np.zeros(5, dtype=np.int32)
+    for pair in range(4):
+        offsets[pair + 1] = offsets[pair] + len(paths.get(pair, ()))
+    route_cells = np.array([cell for pair in range(4) for cell in paths.get(pair, ())], dtype=np.uint16)
+    costs = np.full((2, 2), np.nan, dtype=np.float32)
+    table = PortTable(np.array(ends, dtype=np.uint16), costs, distances, offsets, route_cells,
+                      data_version(engine, DEFAULT_DATE))
+    return engine, table, ends
+
+
+def with_table(engine, table, **kwargs):
+    """An engine sharing engine's data that answers from table."""
+    other = RouteEngine(navigable=engine.navigable, fields=[engine._environment(DEFAULT_DATE)["field"]],
+                        port_tables=True, **kwargs)
+    other._environment(DEFAULT_DATE)[("port_table", "speed", "astar")] = table
+    return other
+
+
+def test_port_table_answers_without_cache(engine_and_table):
+    engine, table, (start, end) = engine_and_table
+    result = with_table(engine, table).route(start, end, "speed")
+    assert result.stats["port_table"] is True
+    assert result.stats["expanded"] == 0
+    assert "cost" not in result.stats
+
+
+def test_port_table_answers_with_route_cache(engine_and_table):
+    engine, table, (start, end) = engine_and_table
+    result = with_table(engine, table, cache=RouteCache()).route(start, end, "speed")
+    assert result.stats.get("port_table") is True
+    assert result.path == engine.route(start, end, "speed", cached=False).path
+
+
+def test_port_table_bypassed_when_not_cached(engine_and_table):
+    engine, table, (start, end) = engine_and_table
+    result = with_table(engine, table, cache=RouteCache()).route(start, end, "speed", cached=False)
+    assert result.stats.get("port_table") is None
+    assert result.stats["expanded"] > 0
@@ -0,0 +1,150 @@
+"""
+Time-dependent routing over multi-day forecasts.
+
+The move costs of consecutive forecast dates are stacked into one cube of shape
+(days, rows, cols, 8). While searching, every cell carries the vessel's elapsed
+sailing time, and a move is charged with the layer of the day the vessel is
+estimated to arrive at its destination, which is a single array lookup.
+
+Each cell keeps only its cheapest arrival, so the search assumes arriving
+earlier is never worse (the usual FIFO assumption of time-dependent A*).
+"""
+import math
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+from gridSearch import DIRECTIONS, STEP_LENGTHS, reconstruct_path, path_length
+from costTensor import edge_cost_tensor, lower_bound_scale
+
+# Nautical miles per grid cell: (37.1 - 8.1) / (135 - 9) degrees of latitude
+# per cell in CoordConv, 60 nautical miles per degree
+CELL_NAUTICAL_MILES = (37.1 - 8.1) / (135 - 9) * 60
+
+# Default service speed in knots
+DEFAULT_SPEED_KNOTS = 14.0
+
+HOURS_PER_DAY = 24.0
+
+
+def build_cost_cube(edge_costs_per_day):
+    """Stack per-date (rows, cols, 8) move costs into a (days, rows, cols, 8) cube."""
+    return np.ascontiguousarray(np.stack(edge_costs_per_day), dtype=np.float32)
+
+
+def time_dependent_search(navigable, start, end, weights, heuristic, alignment, on_expand=None,
+                          cost_cube=None, speed_knots=DEFAULT_SPEED_KNOTS, departure_hour=0.0, dates=None):
+    """
+    A* where each move is costed with the forecast layer for its arrival time.
+
+    Args:
+        navigable (np.ndarray): Boolean (rows, cols) raster, True where a ship may go.
+        start (tuple): Start cell (grid_x, grid_y).
+        end (tuple): End cell (grid_x, grid_y).
+        weights (tuple): (g_weight, distance_weight, heuristic_weight).
+        heuristic (np.ndarray): (rows, cols) per-cell heuristic scores.
+        alignment (np.ndarray): (rows, cols, 8) f-score multipliers for each move out of a cell.
+        on_expand (callable): Optional callback invoked with every expanded cell.
+        cost_cube (np.ndarray): (days, rows, cols, 8) costs from build_cost_cube; a
+            single day built from the other inputs if None.
+        speed_knots (float): Vessel speed used to estimate arrival times.
+        departure_hour (float): Departure, in hours after the start of the first day.
+        dates (list): Date of each cube layer, only used in the stats.
+
+    Returns:
+        tuple: (path or None, explored cells, stats dict)
+    """
+    if departure_hour < 0:
+        raise ValueError("departure_hour must not be negative")
+    if cost_cube is None:
+        cost_cube = build_cost_cube([edge_cost_tensor(weights, heuristic, alignment, navigable)])
+    days, rows, cols, directions = cost_cube.shape
+    size = rows * cols
+    layer_size = size * directions
+    end_x, end_y = end
+    scale = min(lower_bound_scale(layer) for layer in cost_cube)
+    hours_per_cell = CELL_NAUTICAL_MILES / speed_knots
+    costs = memoryview(np.ascontiguousarray(cost_cube, dtype=np.float32).reshape(-1))
+    last_day = days - 1
+
+    g_score = array('d', [math.inf]) * size
+    hours = array('d', [0.0]) * size  # elapsed sailing time on the cheapest arrival
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    moves = [(k, dx, dy, dy * cols + dx, step * hours_per_cell)
+             for k, ((dx, dy), step) in enumerate(zip(DIRECTIONS, STEP_LENGTHS))]
+
+    start_id = start[1] * cols + start[0]
+    end_id = end_y * cols + end_x
+    g_score[start_id] = 0.0
+    hours[start_id] = departure_hour
+    open_heap = [(0.0, start_id)]
+
+    explored = []
+    pushes = 1
+    stale_pops = 0
+    peak_open = 1
+    found = False
+
+    while open_heap:
+        _, cell_id = heappop(open_heap)
+        if closed[cell_id]:
+            stale_pops += 1
+            continue
+        closed[cell_id] = 1
+
+        y, x = divmod(cell_id, cols)
+        if cell_id != start_id and cell_id != end_id:
+            explored.append((x, y))
+            if on_expand is not None:
+                on_expand((x, y))
+
+        if cell_id == end_id:
+            found = True
+            break
+
+        g = g_score[cell_id]
+        now = hours[cell_id]
+        base = cell_id * directions
+        for k, dx, dy, offset, sail_hours in moves:
+            arrival = now + sail_hours
+            day = int(arrival // HOURS_PER_DAY)
+            if day > last_day:
+                day = last_day  # Past the forecast horizon, keep the last day
+            move_cost = costs[day * layer_size + base + k]
+            if move_cost == math.inf:
+                continue
+            neighbor_id = cell_id + offset
+            if closed[neighbor_id]:
+                continue
+            tentative_g = g + move_cost
+            if tentative_g < g_score[neighbor_id]:
+                g_score[neighbor_id] = tentative_g
+                hours[neighbor_id] = arrival
+                parent[neighbor_id] = cell_id
+                heappush(open_heap, (tentative_g + scale * math.hypot(x + dx - end_x, y + dy - end_y), neighbor_id))
+                pushes += 1
+        if len(open_heap) > peak_open:
+            peak_open = len(open_heap)
+
+    stats = {
+        "expanded": len(explored),
+        "pushes": pushes,
+        "stale_pops": stale_pops,
+        "peak_open": peak_open,
+        "cost": g_score[end_id],
+        "distance": math.inf,
+        "forecast_days": days,
+        "arrival_hour": hours[end_id] if found else math.inf,
+    }
+    if dates is not None:
+        stats["forecast_dates"] = list(dates)
+    if not found:
+        return None, explored, stats
+
+    path = reconstruct_path(parent, cols, start_id, end_id)
+    stats["distance"] = path_length(start, path)
+    # Forecast day the vessel is in at each step of the route
+    stats["route_days"] = sorted({min(int(hours[y * cols + x] // HOURS_PER_DAY), last_day) for x, y in path})
+    return path, explored, stats
@@ -1,5 +1,4 @@
 import pygame
-import requests
 import os
 import threading
 from dotenv import load_dotenv
@@ -29,6 +28,7 @@ weather_data_destination = {}
 
 # Function to fetch weather data
 def get_weather_data(latitude, longitude):
+    import requests  # Imported lazily; only the weather threads need it
     url = f"http://api.openweathermap.org/data/2.5/weather?lat={latitude}&lon={longitude}&appid={API_KEY}&units=metric"
     try:
         response = requests.get(url, timeout=5)  # Set timeout to prevent blocking